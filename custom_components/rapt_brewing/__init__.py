@@ -7,9 +7,20 @@ from typing import TYPE_CHECKING
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers import device_registry as dr, entity_registry as er
-
-from .const import DOMAIN
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.helpers.typing import ConfigType
+
+from .const import (
+    CONF_STORAGE_BACKEND,
+    DOMAIN,
+    STORAGE_BACKEND_SQLITE,
+    STORAGE_BACKEND_STORE,
+)
+from .services import async_setup_services
 
 if TYPE_CHECKING:
     from .coordinator import RAPTBrewingCoordinator
@@ -19,11 +30,19 @@ PLATFORMS: list[Platform] = [Platform.SENSOR, Platform.BUTTON, Platform.TEXT, Pl
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 # Type alias for config entry - remove generic typing to avoid issues
 # RAPTBrewingConfigEntry = ConfigEntry[RAPTBrewingData]
 RAPTBrewingConfigEntry = ConfigEntry
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services of RAPT Brewing."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: RAPTBrewingConfigEntry) -> bool:
     """Set up RAPT Brewing from a config entry."""
     try:
@@ -36,6 +55,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: RAPTBrewingConfigEntry)
         await coordinator.async_config_entry_first_refresh()
 
         entry.runtime_data = coordinator
+        entry.async_on_unload(entry.add_update_listener(_async_options_updated))
 
         # Forward setup to all platforms
         await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -45,10 +65,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: RAPTBrewingConfigEntry)
         return False
 
 
+async def _async_options_updated(hass: HomeAssistant, entry: RAPTBrewingConfigEntry) -> None:
+    """Reload the entry when a different storage backend was selected."""
+    backend = entry.options.get(CONF_STORAGE_BACKEND, STORAGE_BACKEND_STORE)
+    if backend == entry.runtime_data.storage_backend:
+        return
+    if entry.runtime_data.storage_backend != STORAGE_BACKEND_SQLITE:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    # Back from SQLite: the JSON store was not written while the database
+    # was in use, so the database is copied into it once nothing records
+    from .sqlite_storage import RAPTBrewingSQLiteStorage
+    from .storage import entry_storage_key
+
+    if not await hass.config_entries.async_unload(entry.entry_id):
+        return
+    await RAPTBrewingSQLiteStorage(
+        hass, entry_storage_key(entry.entry_id)
+    ).async_export_store()
+    await hass.config_entries.async_setup(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: RAPTBrewingConfigEntry) -> bool:
     """Unload a config entry."""
     # BLE coordinator will stop automatically when platforms are unloaded
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        # Flush pending session data before the coordinator goes away
+        await entry.runtime_data.async_shutdown()
+    return unload_ok
 
 
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -94,4 +140,23 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
         hass.config_entries.async_update_entry(entry, version=2)
 
+    if entry.version < 3:
+        # v2 → v3: sessions moved from the shared "rapt_brewing_sessions"
+        # store, which every entry overwrote, to one store per entry. The
+        # shared store cannot be split by entry, so each migrating entry gets
+        # a copy; it is removed once no other entry still needs it.
+        from .storage import async_migrate_legacy_storage
+
+        last_to_migrate = all(
+            other.version >= 3
+            for other in hass.config_entries.async_entries(DOMAIN)
+            if other.entry_id != entry.entry_id
+        )
+        if await async_migrate_legacy_storage(hass, entry.entry_id, last_to_migrate):
+            _LOGGER.info(
+                "Copied shared session storage to entry %s", entry.entry_id
+            )
+
+        hass.config_entries.async_update_entry(entry, version=3)
+
     return True
@@ -0,0 +1,271 @@
+"""Streaming analysis and filtering of session readings."""
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections import deque
+from dataclasses import dataclass
+import math
+
+
+@dataclass(frozen=True)
+class RegressionFit:
+    """Represent a least-squares line fitted to gravity readings."""
+
+    rate: float  # SG/hour
+    rate_stderr: float | None  # standard error of the rate, SG/hour
+    r_squared: float | None
+    count: int
+    span_hours: float
+
+
+class RollingRegression:
+    """Least-squares slope of gravity over a sliding time window.
+
+    Keeps the running sums Σt, Σg, Σt², Σtg and Σg² of the readings in the
+    window, so adding a reading and evicting old ones is O(1) amortized and
+    fitting the line needs no pass over the data. Times and gravities are
+    stored relative to an origin to keep the sums well conditioned; the
+    origin moves forward (recomputing the sums once) as time goes on.
+    """
+
+    def __init__(self, window_seconds: float) -> None:
+        """Initialize the estimator."""
+        self.window_seconds = window_seconds
+        self._readings: deque[tuple[float, float]] = deque()
+        self._reset_sums(0.0, 0.0)
+
+    def _reset_sums(self, origin_time: float, origin_gravity: float) -> None:
+        """Move the origin and recompute the sums from the window."""
+        self._origin_time = origin_time
+        self._origin_gravity = origin_gravity
+        self._sum_t = self._sum_g = self._sum_tt = self._sum_tg = self._sum_gg = 0.0
+        for timestamp, gravity in self._readings:
+            self._accumulate(timestamp, gravity, 1.0)
+
+    def _accumulate(self, timestamp: float, gravity: float, sign: float) -> None:
+        """Add (sign 1) or remove (sign -1) a reading from the sums."""
+        t = timestamp - self._origin_time
+        g = gravity - self._origin_gravity
+        self._sum_t += sign * t
+        self._sum_g += sign * g
+        self._sum_tt += sign * t * t
+        self._sum_tg += sign * t * g
+        self._sum_gg += sign * g * g
+
+    def clear(self) -> None:
+        """Forget all readings."""
+        self._readings.clear()
+        self._reset_sums(0.0, 0.0)
+
+    def add(self, timestamp: float, gravity: float) -> None:
+        """Add a reading and evict those that left the window."""
+        readings = self._readings
+        if readings and timestamp < readings[-1][0]:
+            # Out-of-order reading; the window only moves forward
+            return
+        if not readings or timestamp - self._origin_time > 4 * self.window_seconds:
+            readings.append((timestamp, gravity))
+            self._evict(timestamp)
+            oldest_time, oldest_gravity = readings[0]
+            self._reset_sums(oldest_time, oldest_gravity)
+            return
+        readings.append((timestamp, gravity))
+        self._accumulate(timestamp, gravity, 1.0)
+        self._evict(timestamp)
+
+    def _evict(self, now: float) -> None:
+        """Drop readings older than the window."""
+        readings = self._readings
+        cutoff = now - self.window_seconds
+        while readings[0][0] < cutoff:
+            timestamp, gravity = readings.popleft()
+            self._accumulate(timestamp, gravity, -1.0)
+
+    def fit(self) -> RegressionFit | None:
+        """Return the fitted line, or None with fewer than two distinct times."""
+        count = len(self._readings)
+        if count < 2:
+            return None
+        s_tt = self._sum_tt - self._sum_t * self._sum_t / count
+        if s_tt <= 0:
+            return None
+        s_tg = self._sum_tg - self._sum_t * self._sum_g / count
+        s_gg = self._sum_gg - self._sum_g * self._sum_g / count
+        slope = s_tg / s_tt
+
+        rate_stderr = None
+        if count > 2:
+            residual = max(0.0, s_gg - slope * s_tg)
+            rate_stderr = math.sqrt(residual / (count - 2) / s_tt) * 3600
+        r_squared = None
+        if s_gg > 0:
+            r_squared = max(0.0, min(1.0, slope * s_tg / s_gg))
+
+        return RegressionFit(
+            rate=slope * 3600,
+            rate_stderr=rate_stderr,
+            r_squared=r_squared,
+            count=count,
+            span_hours=(self._readings[-1][0] - self._readings[0][0]) / 3600,
+        )
+
+
+class GravityBandTracker:
+    """Track when gravity was last outside a band around the newest reading.
+
+    Keeps two monotonic stacks of readings: one whose gravities strictly
+    decrease from oldest to newest and one whose gravities strictly increase.
+    A new reading first removes the older entries it dominates (they can
+    never again be the latest reading above, or below, any threshold), so
+    adding a reading is O(1) amortized. The latest reading above a threshold
+    is then the newest entry of the decreasing stack still above it, found
+    by bisection; likewise below for the increasing stack.
+
+    Gravities are quantized, so each stack holds at most one entry per
+    quantum of the gravity range however long the session runs.
+    """
+
+    def __init__(self, quantum: float = 0.0001) -> None:
+        """Initialize the tracker."""
+        self._quantum = quantum
+        self._current: int | None = None
+        # Decreasing stack, negated so that it is sorted ascending
+        self._high_values: list[int] = []
+        self._high_times: list[float] = []
+        self._low_values: list[int] = []
+        self._low_times: list[float] = []
+
+    def clear(self) -> None:
+        """Forget all readings."""
+        self._current = None
+        self._high_values.clear()
+        self._high_times.clear()
+        self._low_values.clear()
+        self._low_times.clear()
+
+    def add(self, timestamp: float, gravity: float) -> None:
+        """Add the newest reading."""
+        value = round(gravity / self._quantum)
+        self._current = value
+
+        high_values = self._high_values
+        while high_values and -high_values[-1] <= value:
+            high_values.pop()
+            self._high_times.pop()
+        high_values.append(-value)
+        self._high_times.append(timestamp)
+
+        low_values = self._low_values
+        while low_values and low_values[-1] >= value:
+            low_values.pop()
+            self._low_times.pop()
+        low_values.append(value)
+        self._low_times.append(timestamp)
+
+    def last_outside(self, band: float) -> float | None:
+        """Return when gravity was last more than ``band`` from the newest reading."""
+        if self._current is None:
+            return None
+        width = round(band / self._quantum)
+        latest = None
+        above = bisect_left(self._high_values, -(self._current + width))
+        if above:
+            latest = self._high_times[above - 1]
+        below = bisect_left(self._low_values, self._current - width)
+        if below and (latest is None or self._low_times[below - 1] > latest):
+            latest = self._low_times[below - 1]
+        return latest
+
+
+class RollingMedian:
+    """Median of the last ``window`` readings.
+
+    Removes isolated spikes, such as a tilt reading taken while the Pill
+    was knocked, before they reach the Kalman filter.
+    """
+
+    def __init__(self, window: int) -> None:
+        """Initialize the filter."""
+        self.window = window
+        self._values: deque[float] = deque()
+        self._sorted: list[float] = []
+
+    def clear(self) -> None:
+        """Forget all readings."""
+        self._values.clear()
+        self._sorted.clear()
+
+    def update(self, timestamp: float, value: float) -> float:
+        """Add a reading and return the median of the window."""
+        self._values.append(value)
+        insort(self._sorted, value)
+        if len(self._values) > self.window:
+            del self._sorted[bisect_left(self._sorted, self._values.popleft())]
+        count = len(self._sorted)
+        middle = count // 2
+        if count % 2:
+            return self._sorted[middle]
+        return (self._sorted[middle - 1] + self._sorted[middle]) / 2
+
+
+class KalmanFilter:
+    """One-dimensional Kalman filter of a slowly drifting reading.
+
+    The true value is modelled as a random walk whose standard deviation
+    grows by ``process_noise`` per square root of an hour, observed with
+    ``measurement_noise`` standard deviation. A measurement noise of 0
+    passes readings through unchanged.
+    """
+
+    def __init__(self, process_noise: float, measurement_noise: float) -> None:
+        """Initialize the filter."""
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self._estimate: float | None = None
+        self._variance = 0.0
+        self._timestamp = 0.0
+
+    def clear(self) -> None:
+        """Forget all readings."""
+        self._estimate = None
+
+    def update(self, timestamp: float, value: float) -> float:
+        """Add a reading and return the filtered value."""
+        measurement_variance = self.measurement_noise * self.measurement_noise
+        if self._estimate is None:
+            self._estimate = value
+            self._variance = measurement_variance
+            self._timestamp = timestamp
+            return value
+
+        elapsed_hours = max(0.0, timestamp - self._timestamp) / 3600
+        self._timestamp = max(self._timestamp, timestamp)
+        variance = self._variance + self.process_noise * self.process_noise * elapsed_hours
+        total = variance + measurement_variance
+        gain = variance / total if total > 0 else 1.0
+        self._estimate += gain * (value - self._estimate)
+        self._variance = (1 - gain) * variance
+        return self._estimate
+
+
+class FilterPipeline:
+    """Chain of noise filters applied to one reading channel.
+
+    Each stage has ``update(timestamp, value) -> float`` and ``clear()``
+    and keeps a bounded state, so filtering costs O(1) per reading.
+    """
+
+    def __init__(self, *stages: RollingMedian | KalmanFilter) -> None:
+        """Initialize the pipeline."""
+        self.stages = stages
+
+    def clear(self) -> None:
+        """Forget all readings."""
+        for stage in self.stages:
+            stage.clear()
+
+    def update(self, timestamp: float, value: float) -> float:
+        """Pass a reading through every stage and return the result."""
+        for stage in self.stages:
+            value = stage.update(timestamp, value)
+        return value
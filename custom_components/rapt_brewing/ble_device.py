@@ -1,6 +1,8 @@
 """BLE device handler for RAPT Pill integration."""
 from __future__ import annotations
 
+from collections import OrderedDict
+from collections.abc import Iterable
 import logging
 import struct
 from dataclasses import dataclass
@@ -15,20 +17,41 @@ from homeassistant.components.bluetooth.passive_update_processor import (
 )
 from homeassistant.core import HomeAssistant
 
+from .decoders import find_decoder
+
 _LOGGER = logging.getLogger(__name__)
 
 # RAPT Pill Bluetooth manufacturer IDs
 RAPT_MANUFACTURER_ID = 16722  # 0x4152 - "RA" from RAPT
 KEGLAND_MANUFACTURER_ID = 17739  # 0x454B - "KE" from KEG
 
-# Data start patterns for manufacturer data
-RAPT_DATA_START = [80, 84]  # "PT" - Pill Telemetry
-KEGLAND_DATA_START = [71]   # "G" - General/Version
+# Number of recently decoded advertisements kept by the parser
+PARSE_CACHE_SIZE = 32
+
+# Fields whose change makes a new reading; firmware, device type and the
+# like only describe the device
+TELEMETRY_FIELDS = frozenset({
+    "temperature",
+    "gravity",
+    "gravity_velocity",
+    "gravity_velocity_valid",
+    "battery",
+    "signal_strength",
+    "accelerometer_x",
+    "accelerometer_y",
+    "accelerometer_z",
+})
 
 
 @dataclass
 class RAPTPillSensorData:
-    """RAPT Pill sensor data."""
+    """RAPT Pill sensor data.
+
+    The parser keeps one instance per device and merges every decoded packet
+    into it, so values sent in separate packets (telemetry, firmware, device
+    type) are all kept. ``sequence`` increases whenever a telemetry value
+    changes.
+    """
     
     temperature: float | None = None
     gravity: float | None = None
@@ -43,6 +66,25 @@ class RAPTPillSensorData:
     device_type: str | None = None
     mac_address: str | None = None
     data_format_version: int | None = None
+    timestamp: float | None = None  # epoch seconds the values were taken, if known
+    sequence: int = 0
+
+    def merge(self, other: RAPTPillSensorData, fields: Iterable[str]) -> bool:
+        """Copy the given fields from another instance in place.
+
+        Returns whether a telemetry value changed, in which case ``sequence``
+        is increased.
+        """
+        changed = False
+        for name in fields:
+            value = getattr(other, name)
+            if getattr(self, name) != value:
+                setattr(self, name, value)
+                if name in TELEMETRY_FIELDS:
+                    changed = True
+        if changed:
+            self.sequence += 1
+        return changed
     
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
@@ -60,6 +102,8 @@ class RAPTPillSensorData:
             "device_type": self.device_type,
             "mac_address": self.mac_address,
             "data_format_version": self.data_format_version,
+            "timestamp": self.timestamp,
+            "sequence": self.sequence,
         }
 
 
@@ -69,279 +113,139 @@ class RAPTPillBLEParser:
     def __init__(self) -> None:
         """Initialize the parser."""
         self._last_data: RAPTPillSensorData | None = None
+        # Merged state of each device, by address
+        self._devices: dict[str, RAPTPillSensorData] = {}
+        # Proxies and adapters repeat the same advertisement many times per
+        # second; decoded payloads are kept so repeats skip decoding
+        self._cache: OrderedDict[
+            tuple[str, int, bytes],
+            tuple[tuple[str, ...], RAPTPillSensorData] | None,
+        ] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
     
     def parse_advertisement(
         self, service_info: BluetoothServiceInfoBleak
     ) -> RAPTPillSensorData | None:
-        """Parse BLE advertisement data."""
+        """Parse BLE advertisement data into the state of its device.
+
+        Returns the merged state of the device, or the last state when the
+        advertisement held nothing that could be decoded.
+        """
         manufacturer_data = service_info.manufacturer_data
-        
-        _LOGGER.debug("RAPT PARSER: Received manufacturer data: %s", 
-                       {k: v.hex() for k, v in manufacturer_data.items()})
-        
-        # Check for RAPT manufacturer data
-        if RAPT_MANUFACTURER_ID in manufacturer_data:
-            data = manufacturer_data[RAPT_MANUFACTURER_ID]
-            _LOGGER.debug("RAPT PARSER: RAPT data length=%d, hex=%s", len(data), data.hex())
-            if len(data) >= 2 and list(data[:2]) == RAPT_DATA_START:
-                _LOGGER.debug("RAPT PARSER: Parsing metrics data with PT prefix")
-                parsed_data = self._parse_metrics_data(data)
-                if parsed_data:
-                    self._last_data = parsed_data
-                    _LOGGER.debug("RAPT PARSER: Successfully parsed data: temp=%.2f, gravity=%.4f", 
-                                   parsed_data.temperature or 0, parsed_data.gravity or 0)
-                    return parsed_data
-                else:
-                    _LOGGER.warning("RAPT PARSER: Failed to parse metrics data")
+
+        for manufacturer_id in (RAPT_MANUFACTURER_ID, KEGLAND_MANUFACTURER_ID):
+            data = manufacturer_data.get(manufacturer_id)
+            if data is None:
+                continue
+
+            cache_key = (service_info.address, manufacturer_id, bytes(data))
+            if cache_key in self._cache:
+                self.cache_hits += 1
+                self._cache.move_to_end(cache_key)
+                decoded = self._cache[cache_key]
             else:
-                _LOGGER.debug("RAPT PARSER: Data doesn't start with PT prefix: %s", data[:2].hex())
-        
-        # Check for KegLand manufacturer data  
-        if KEGLAND_MANUFACTURER_ID in manufacturer_data:
-            data = manufacturer_data[KEGLAND_MANUFACTURER_ID]
-            if len(data) >= 1 and data[0] == KEGLAND_DATA_START[0]:
-                # Version data - not used for sensor values
-                _LOGGER.debug("Received KegLand version data")
-        
+                self.cache_misses += 1
+                decoded = self._parse_frame(manufacturer_id, data)
+                self._cache[cache_key] = decoded
+                if len(self._cache) > PARSE_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+
+            if decoded:
+                fields, packet = decoded
+                state = self._devices.get(service_info.address)
+                if state is None:
+                    state = self._devices[service_info.address] = RAPTPillSensorData()
+                state.merge(packet, fields)
+                self._last_data = state
+
         return self._last_data
-    
-    def _parse_metrics_data(self, data: bytes) -> RAPTPillSensorData | None:
-        """Parse metrics data from RAPT manufacturer data."""
-        if len(data) < 4:
-            _LOGGER.warning("RAPT data too short: %d bytes", len(data))
-            return None
-        
-        try:
-            _LOGGER.debug("Parsing RAPT data: %d bytes: %s", len(data), data.hex())
-            
-            # Check for different packet types based on prefix
-            if data[:4] == b'RAPT':
-                return self._parse_rapt_telemetry(data)
-            elif data[:3] == b'KEG':
-                return self._parse_keg_firmware(data)
-            elif data[:2] == b'PT':
-                return self._parse_legacy_format(data)
-            else:
-                _LOGGER.warning("Unknown RAPT packet format: %s", data[:4].hex())
-                return None
-                
-        except Exception as e:
-            _LOGGER.error("Error parsing RAPT data: %s", e)
-            return None
-    
-    def _parse_rapt_telemetry(self, data: bytes) -> RAPTPillSensorData | None:
-        """Parse RAPT telemetry data (v1 and v2 formats)."""
-        if len(data) < 26:  # Minimum for v1 format
-            _LOGGER.warning("RAPT telemetry data too short: %d bytes", len(data))
-            return None
-        
-        try:
-            # Skip "RAPT" prefix (4 bytes)
-            payload = data[4:]
-            
-            # Get format version
-            format_version = payload[0]
-            _LOGGER.debug("RAPT format version: %d", format_version)
-            
-            if format_version == 1:
-                return self._parse_v1_format(payload)
-            elif format_version == 2:
-                return self._parse_v2_format(payload)
-            else:
-                _LOGGER.warning("Unknown RAPT format version: %d", format_version)
-                return None
-                
-        except Exception as e:
-            _LOGGER.error("Error parsing RAPT telemetry: %s", e)
-            return None
-    
-    def _parse_v1_format(self, payload: bytes) -> RAPTPillSensorData | None:
-        """Parse v1 format: 0x01 mm mm mm mm mm mm tt tt gg gg gg gg xx xx yy yy zz zz bb bb"""
-        if len(payload) < 21:
-            _LOGGER.warning("v1 payload too short: %d bytes", len(payload))
-            return None
-        
-        try:
-            # v1 format: B6sHfhhhh (version + MAC + temp + gravity + accel_x + accel_y + accel_z + battery)
-            unpacked = struct.unpack(">B6sHfhhhh", payload[:21])
-            
-            version = unpacked[0]
-            mac_bytes = unpacked[1]
-            temp_raw = unpacked[2] 
-            gravity_float = unpacked[3]
-            accel_x_raw = unpacked[4]
-            accel_y_raw = unpacked[5]
-            accel_z_raw = unpacked[6]
-            battery_raw = unpacked[7]
-            
-            # Convert using official RAPT formulas
-            temperature = temp_raw / 128.0 - 273.15  # Kelvin to Celsius
-            gravity = gravity_float / 1000.0
-            battery = int(battery_raw / 256.0)
-            accel_x = accel_x_raw / 16.0
-            accel_y = accel_y_raw / 16.0  
-            accel_z = accel_z_raw / 16.0
-            mac_address = ':'.join(f'{b:02x}' for b in mac_bytes)
-            
-            _LOGGER.debug("v1 - temp=%.2f°C, gravity=%.4f, battery=%d%%, accel=(%.2f,%.2f,%.2f)", 
-                         temperature, gravity, battery, accel_x, accel_y, accel_z)
-            
-            return RAPTPillSensorData(
-                temperature=temperature,
-                gravity=gravity,
-                battery=battery,
-                accelerometer_x=accel_x,
-                accelerometer_y=accel_y,
-                accelerometer_z=accel_z,
-                mac_address=mac_address,
-                data_format_version=version
-            )
-            
-        except struct.error as e:
-            _LOGGER.error("v1 struct unpack failed: %s", e)
-            return None
-    
-    def _parse_v2_format(self, payload: bytes) -> RAPTPillSensorData | None:
-        """Parse v2 format: 0x02 0x00 cc vv vv vv vv tt tt gg gg gg gg xx xx yy yy zz zz bb bb"""
-        if len(payload) < 23:
-            _LOGGER.warning("v2 payload too short: %d bytes", len(payload))
+
+    def _parse_frame(
+        self, manufacturer_id: int, data: bytes
+    ) -> tuple[tuple[str, ...], RAPTPillSensorData] | None:
+        """Decode the manufacturer data of one company ID.
+
+        Returns the decoded fields and an instance holding them.
+        """
+        company_id = manufacturer_id.to_bytes(2, "little")
+        # Some proxies forward the company ID as part of the data
+        frame = data if data[:2] == company_id else company_id + data
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("RAPT PARSER: Frame length=%d, hex=%s", len(frame), frame.hex())
+
+        decoder = find_decoder(frame)
+        if decoder is None:
+            _LOGGER.debug("RAPT PARSER: Unknown packet format: %s", frame[:5].hex())
             return None
-        
-        try:
-            # v2 format: BB B f H f hhhh (version + reserved + velocity_valid + velocity + temp + gravity + accel_x + accel_y + accel_z + battery)
-            unpacked = struct.unpack(">BBBfHfhhhh", payload[:23])
-            
-            version = unpacked[0]
-            reserved = unpacked[1]  # Should be 0x00
-            velocity_valid = unpacked[2] == 1
-            gravity_velocity = unpacked[3] if velocity_valid else None
-            temp_raw = unpacked[4] 
-            gravity_float = unpacked[5]
-            accel_x_raw = unpacked[6]
-            accel_y_raw = unpacked[7]
-            accel_z_raw = unpacked[8]
-            battery_raw = unpacked[9]
-            
-            # Convert using official RAPT formulas
-            temperature = temp_raw / 128.0 - 273.15  # Kelvin to Celsius
-            gravity = gravity_float / 1000.0
-            battery = int(battery_raw / 256.0)
-            accel_x = accel_x_raw / 16.0
-            accel_y = accel_y_raw / 16.0  
-            accel_z = accel_z_raw / 16.0
-            
-            # For v2, calculate MAC from BLE address (subtract 2 from last octet)
-            # This would need to be done in the caller since we don't have BLE address here
-            
-            _LOGGER.debug("v2 - temp=%.2f°C, gravity=%.4f, battery=%d%%, velocity=%.4f (valid=%s), accel=(%.2f,%.2f,%.2f)", 
-                         temperature, gravity, battery, gravity_velocity or 0, velocity_valid, accel_x, accel_y, accel_z)
-            
-            return RAPTPillSensorData(
-                temperature=temperature,
-                gravity=gravity,
-                gravity_velocity=gravity_velocity,
-                gravity_velocity_valid=velocity_valid,
-                battery=battery,
-                accelerometer_x=accel_x,
-                accelerometer_y=accel_y,
-                accelerometer_z=accel_z,
-                data_format_version=version
+        if len(frame) < decoder.min_length:
+            _LOGGER.warning(
+                "RAPT PARSER: %s packet too short: %d bytes (need %d)",
+                decoder.name, len(frame), decoder.min_length,
             )
-            
-        except struct.error as e:
-            _LOGGER.error("v2 struct unpack failed: %s", e)
-            return None
-    
-    def _parse_keg_firmware(self, data: bytes) -> RAPTPillSensorData | None:
-        """Parse KEG firmware version packet: 0x4b 0x45 0x47 <firmware version string>"""
-        if len(data) < 4:
-            return None
-        
-        try:
-            # Skip "KEG" prefix (3 bytes)
-            firmware_version = data[3:].decode('utf-8', errors='ignore').strip()
-            _LOGGER.debug("Firmware version: %s", firmware_version)
-            
-            return RAPTPillSensorData(firmware_version=firmware_version)
-            
-        except Exception as e:
-            _LOGGER.error("Error parsing firmware version: %s", e)
-            return None
-    
-    def _parse_device_type(self, data: bytes) -> RAPTPillSensorData | None:
-        """Parse device type packet: 0x52 0x41 0x50 0x54 0x64 <device type string>"""
-        if len(data) < 6:
-            return None
-        
-        try:
-            # Skip "RAPT" + 0x64 prefix (5 bytes)
-            device_type = data[5:].decode('utf-8', errors='ignore').strip()
-            _LOGGER.debug("Device type: %s", device_type)
-            
-            return RAPTPillSensorData(device_type=device_type)
-            
-        except Exception as e:
-            _LOGGER.error("Error parsing device type: %s", e)
-            return None
-    
-    def _parse_legacy_format(self, data: bytes) -> RAPTPillSensorData | None:
-        """Parse legacy format for backwards compatibility."""
-        _LOGGER.debug("Legacy format: received %d bytes: %s", len(data), data.hex())
-        
-        if len(data) < 23:
-            _LOGGER.warning("Legacy format data too short: %d bytes (need 23), data: %s", len(data), data.hex())
-            # Log the payload after PT prefix to understand what's being sent
-            if len(data) > 2:
-                payload = data[2:]
-                _LOGGER.info("Short packet payload (%d bytes): %s", len(payload), payload.hex())
             return None
-        
+
+        parsed_data = RAPTPillSensorData()
         try:
-            # Skip "PT" prefix and use old parsing logic
-            payload = data[2:]
-            _LOGGER.debug("Legacy format: payload %d bytes: %s", len(payload), payload.hex())
-            
-            if len(payload) >= 21:
-                _LOGGER.debug("Legacy format: attempting struct unpack on 21 bytes: %s", payload[:21].hex())
-                unpacked = struct.unpack(">B6sHfhhhh", payload[:21])
-                
-                version = unpacked[0]
-                mac_bytes = unpacked[1]
-                temp_raw = unpacked[2] 
-                gravity_float = unpacked[3]
-                accel_x_raw = unpacked[4]
-                accel_y_raw = unpacked[5]
-                accel_z_raw = unpacked[6]
-                battery_raw = unpacked[7]
-                
-                # Convert using official RAPT formulas
-                temperature = temp_raw / 128.0 - 273.15  # Kelvin to Celsius
-                gravity = gravity_float / 1000.0
-                battery = int(battery_raw / 256.0)
-                accel_x = accel_x_raw / 16.0
-                accel_y = accel_y_raw / 16.0  
-                accel_z = accel_z_raw / 16.0
-                
-                _LOGGER.debug("Legacy - temp=%.2f°C, gravity=%.4f, battery=%d%%", 
-                             temperature, gravity, battery)
-                
-                return RAPTPillSensorData(
-                    temperature=temperature,
-                    gravity=gravity,
-                    battery=battery,
-                    accelerometer_x=accel_x,
-                    accelerometer_y=accel_y,
-                    accelerometer_z=accel_z,
-                    data_format_version=version
-                )
-            else:
-                _LOGGER.warning("Legacy payload too short: %d bytes", len(payload))
-                return None
-                
-        except struct.error as e:
-            _LOGGER.error("Legacy struct unpack failed: %s", e)
+            decoder.decode(frame, parsed_data)
+        except (struct.error, ValueError) as err:
+            _LOGGER.error("RAPT PARSER: Failed to decode %s packet: %s", decoder.name, err)
             return None
 
+        _LOGGER.debug("RAPT PARSER: Decoded %s packet: %s", decoder.name, parsed_data)
+        return decoder.fields, parsed_data
+
+
+# Entity key, description and name of each sensor of the processor, by
+# sensor data field
+_SENSOR_METADATA: dict[str, tuple[str, dict[str, str], str]] = {
+    "temperature": (
+        "temperature",
+        {
+            "device_class": "temperature",
+            "native_unit_of_measurement": "°C",
+            "state_class": "measurement",
+        },
+        "Temperature",
+    ),
+    "gravity": (
+        "gravity",
+        {
+            "icon": "mdi:speedometer",
+            "state_class": "measurement",
+        },
+        "Gravity",
+    ),
+    "battery": (
+        "battery",
+        {
+            "device_class": "battery",
+            "native_unit_of_measurement": "%",
+            "state_class": "measurement",
+        },
+        "Battery",
+    ),
+    "signal_strength": (
+        "signal_strength",
+        {
+            "device_class": "signal_strength",
+            "native_unit_of_measurement": "dBm",
+            "state_class": "measurement",
+        },
+        "Signal Strength",
+    ),
+}
+# Sensors only reported when the Pill sent a value; signal strength always is
+_OPTIONAL_SENSOR_FIELDS = ("temperature", "gravity", "battery")
+
+# Returned for advertisements without RAPT data; never modified
+_EMPTY_UPDATE = PassiveBluetoothDataUpdate(
+    devices={},
+    entity_descriptions={},
+    entity_names={},
+    entity_data={},
+)
+
 
 class RAPTPillBluetoothDeviceData(PassiveBluetoothDataProcessor):
     """Data processor for RAPT Pill Bluetooth devices."""
@@ -353,6 +257,8 @@ class RAPTPillBluetoothDeviceData(PassiveBluetoothDataProcessor):
         self.device_name = device_name
         self.parser = RAPTPillBLEParser()
         self._last_service_info: BluetoothServiceInfoBleak | None = None
+        # Entity metadata by (address, sensor data fields present)
+        self._metadata: dict[tuple[str, tuple[str, ...]], tuple] = {}
         
         # Log that the BLE device processor was created
         _LOGGER.warning("RAPT BLE DEVICE PROCESSOR CREATED for device: %s", device_name)
@@ -362,8 +268,9 @@ class RAPTPillBluetoothDeviceData(PassiveBluetoothDataProcessor):
     ) -> PassiveBluetoothDataUpdate:
         """Handle Bluetooth data updates."""
         # Log every BLE update we receive - useful for connection monitoring
-        _LOGGER.debug("RAPT BLE UPDATE: Device: %s, Manufacturers: %s", 
-                     service_info.address, list(service_info.manufacturer_data.keys()))
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("RAPT BLE UPDATE: Device: %s, Manufacturers: %s", 
+                         service_info.address, list(service_info.manufacturer_data.keys()))
         
         self._last_service_info = service_info
         
@@ -375,80 +282,63 @@ class RAPTPillBluetoothDeviceData(PassiveBluetoothDataProcessor):
         )
         
         if not is_rapt_device:
-            # Return empty update for non-RAPT devices
-            return PassiveBluetoothDataUpdate(
-                devices={},
-                entity_descriptions={},
-                entity_names={},
-                entity_data={},
-            )
+            return _EMPTY_UPDATE
         
         # Parse sensor data
         sensor_data = self.parser.parse_advertisement(service_info)
         
         if not sensor_data:
-            # Return empty update if no valid data
-            return PassiveBluetoothDataUpdate(
-                devices={},
-                entity_descriptions={},
-                entity_names={},
-                entity_data={},
-            )
+            return _EMPTY_UPDATE
         
-        # Signal strength from service info
-        signal_strength = service_info.rssi
-        
-        # Create device identifier
+        # Only the values change from one advertisement to the next; the
+        # entity metadata is built once per device and set of sensors
         device_id = service_info.address
+        fields = tuple(
+            field for field in _OPTIONAL_SENSOR_FIELDS
+            if getattr(sensor_data, field) is not None
+        )
+        metadata = self._metadata.get((device_id, fields))
+        if metadata is None:
+            metadata = self._metadata[(device_id, fields)] = self._build_metadata(
+                device_id, fields
+            )
+        devices, entity_descriptions, entity_names, value_keys, signal_key = metadata
+
+        entity_data = {key: getattr(sensor_data, field) for field, key in value_keys}
+        # Signal strength from service info
+        entity_data[signal_key] = service_info.rssi
         
-        # Create entity data updates
-        entity_data = {}
-        entity_descriptions = {}
-        entity_names = {}
-        
-        # Temperature sensor
-        if sensor_data.temperature is not None:
-            key = PassiveBluetoothEntityKey(device_id, "temperature")
-            entity_data[key] = sensor_data.temperature
-            entity_descriptions[key] = {
-                "device_class": "temperature",
-                "native_unit_of_measurement": "°C",
-                "state_class": "measurement",
-            }
-            entity_names[key] = f"{self.device_name} Temperature"
-        
-        # Gravity sensor
-        if sensor_data.gravity is not None:
-            key = PassiveBluetoothEntityKey(device_id, "gravity")
-            entity_data[key] = sensor_data.gravity
-            entity_descriptions[key] = {
-                "icon": "mdi:speedometer",
-                "state_class": "measurement",
-            }
-            entity_names[key] = f"{self.device_name} Gravity"
-        
-        # Battery sensor
-        if sensor_data.battery is not None:
-            key = PassiveBluetoothEntityKey(device_id, "battery")
-            entity_data[key] = sensor_data.battery
-            entity_descriptions[key] = {
-                "device_class": "battery",
-                "native_unit_of_measurement": "%",
-                "state_class": "measurement",
-            }
-            entity_names[key] = f"{self.device_name} Battery"
-        
-        # Signal strength sensor
-        key = PassiveBluetoothEntityKey(device_id, "signal_strength")
-        entity_data[key] = signal_strength
-        entity_descriptions[key] = {
-            "device_class": "signal_strength",
-            "native_unit_of_measurement": "dBm",
-            "state_class": "measurement",
+        return PassiveBluetoothDataUpdate(
+            devices=devices,
+            entity_descriptions=entity_descriptions,
+            entity_names=entity_names,
+            entity_data=entity_data,
+        )
+
+    def _build_metadata(self, device_id: str, fields: tuple[str, ...]) -> tuple[
+        dict[str, Any],
+        dict[PassiveBluetoothEntityKey, Any],
+        dict[PassiveBluetoothEntityKey, str],
+        tuple[tuple[str, PassiveBluetoothEntityKey], ...],
+        PassiveBluetoothEntityKey,
+    ]:
+        """Build the device info and entity metadata of a set of sensors.
+
+        Also returns the entity key of each sensor data field, and that of
+        the signal strength, which comes from the service info.
+        """
+        value_keys = tuple(
+            (field, PassiveBluetoothEntityKey(device_id, _SENSOR_METADATA[field][0]))
+            for field in fields
+        )
+        signal_key = PassiveBluetoothEntityKey(device_id, "signal_strength")
+        keys = (*value_keys, ("signal_strength", signal_key))
+        entity_descriptions = {
+            key: _SENSOR_METADATA[field][1] for field, key in keys
+        }
+        entity_names = {
+            key: f"{self.device_name} {_SENSOR_METADATA[field][2]}" for field, key in keys
         }
-        entity_names[key] = f"{self.device_name} Signal Strength"
-        
-        # Device information
         devices = {
             device_id: {
                 "name": self.device_name,
@@ -458,13 +348,7 @@ class RAPTPillBluetoothDeviceData(PassiveBluetoothDataProcessor):
                 "hw_version": None,
             }
         }
-        
-        return PassiveBluetoothDataUpdate(
-            devices=devices,
-            entity_descriptions=entity_descriptions,
-            entity_names=entity_names,
-            entity_data=entity_data,
-        )
+        return devices, entity_descriptions, entity_names, value_keys, signal_key
     
     def get_last_sensor_data(self) -> RAPTPillSensorData | None:
         """Get the last parsed sensor data."""
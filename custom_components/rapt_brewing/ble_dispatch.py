@@ -0,0 +1,94 @@
+"""Domain-wide dispatch of RAPT advertisements to the config entries."""
+from __future__ import annotations
+
+from collections.abc import Callable
+import logging
+
+from homeassistant.components.bluetooth import (
+    BluetoothChange,
+    BluetoothScanningMode,
+    BluetoothServiceInfoBleak,
+    async_register_callback,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .ble_device import KEGLAND_MANUFACTURER_ID, RAPT_MANUFACTURER_ID
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_BLE_DISPATCHER = f"{DOMAIN}_ble_dispatcher"
+
+
+class RAPTBluetoothDispatcher:
+    """Route RAPT advertisements to the config entry of each Pill.
+
+    The Bluetooth callbacks are registered once for the whole domain, one
+    per RAPT manufacturer ID, however many Pills are configured. Each
+    advertisement is handed to the handler of its address through a dict
+    lookup, so its cost does not grow with the number of Pills.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the dispatcher."""
+        self.hass = hass
+        self._handlers: dict[str, Callable[[BluetoothServiceInfoBleak], None]] = {}
+        self._unsub_callbacks: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_register(
+        self, address: str, handler: Callable[[BluetoothServiceInfoBleak], None]
+    ) -> CALLBACK_TYPE:
+        """Register the handler of a Pill; return a function to unregister it."""
+        if not self._unsub_callbacks:
+            self._async_start()
+        self._handlers[address] = handler
+
+        @callback
+        def _async_unregister() -> None:
+            if self._handlers.get(address) is handler:
+                del self._handlers[address]
+            if not self._handlers:
+                self._async_stop()
+
+        return _async_unregister
+
+    @callback
+    def _async_start(self) -> None:
+        """Register the Bluetooth callbacks of the domain."""
+        self._unsub_callbacks = [
+            async_register_callback(
+                self.hass,
+                self._async_handle_advertisement,
+                {"manufacturer_id": manufacturer_id},
+                BluetoothScanningMode.PASSIVE,
+            )
+            for manufacturer_id in (RAPT_MANUFACTURER_ID, KEGLAND_MANUFACTURER_ID)
+        ]
+        _LOGGER.debug("RAPT DISPATCHER: Registered Bluetooth callbacks")
+
+    @callback
+    def _async_stop(self) -> None:
+        """Unregister the Bluetooth callbacks of the domain."""
+        for unsub in self._unsub_callbacks:
+            unsub()
+        self._unsub_callbacks = []
+        _LOGGER.debug("RAPT DISPATCHER: Unregistered Bluetooth callbacks")
+
+    @callback
+    def _async_handle_advertisement(
+        self, service_info: BluetoothServiceInfoBleak, change: BluetoothChange
+    ) -> None:
+        """Hand an advertisement to the handler of its address."""
+        handler = self._handlers.get(service_info.address)
+        if handler is not None:
+            handler(service_info)
+
+
+@callback
+def async_get_dispatcher(hass: HomeAssistant) -> RAPTBluetoothDispatcher:
+    """Return the dispatcher of the domain, creating it on first use."""
+    dispatcher: RAPTBluetoothDispatcher | None = hass.data.get(DATA_BLE_DISPATCHER)
+    if dispatcher is None:
+        dispatcher = hass.data[DATA_BLE_DISPATCHER] = RAPTBluetoothDispatcher(hass)
+    return dispatcher
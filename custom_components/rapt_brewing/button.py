@@ -129,7 +129,7 @@ class RAPTBrewingButton(RAPTBrewingEntity, ButtonEntity):
             for alert in session.alerts:
                 alert.acknowledged = True
             
-            await self.coordinator._save_data()
+            self.coordinator.async_schedule_save(session)
             await self.coordinator.async_request_refresh()
             
             _LOGGER.warning("RAPT BUTTON: Cleared %d alert(s) for session: %s", 
@@ -0,0 +1,181 @@
+"""Batch decoding of captured RAPT advertisements.
+
+A capture is a sequence of length-prefixed packets: a big-endian 16-bit
+length followed by that many bytes of frame, i.e. the manufacturer data of
+an advertisement with its company ID in front (see ``decoders``). All
+telemetry packets of a capture are decoded at once with NumPy structured
+dtypes, which makes replaying months of captures a matter of seconds.
+
+NumPy is only imported when a capture is decoded.
+"""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+import logging
+import os
+from typing import TYPE_CHECKING
+
+from .decoders import (
+    DEVICE_TYPE_VERSION,
+    RAPT_PREFIX,
+    TELEMETRY_OFFSET,
+    TELEMETRY_V1,
+    TELEMETRY_V2,
+    acceleration_from_raw,
+    battery_from_raw,
+    gravity_from_raw,
+    temperature_from_raw,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_LOGGER = logging.getLogger(__name__)
+
+# NumPy equivalents of the TELEMETRY_V1 and TELEMETRY_V2 struct layouts
+_V1_FIELDS = [
+    ("version", "u1"),
+    ("mac", "V6"),
+    ("temperature", ">u2"),
+    ("gravity", ">f4"),
+    ("accelerometer_x", ">i2"),
+    ("accelerometer_y", ">i2"),
+    ("accelerometer_z", ">i2"),
+    ("battery", ">i2"),
+]
+_V2_FIELDS = [
+    ("version", "u1"),
+    ("reserved", "u1"),
+    ("velocity_valid", "u1"),
+    ("velocity", ">f4"),
+    ("temperature", ">u2"),
+    ("gravity", ">f4"),
+    ("accelerometer_x", ">i2"),
+    ("accelerometer_y", ">i2"),
+    ("accelerometer_z", ">i2"),
+    ("battery", ">i2"),
+]
+
+
+@dataclass(frozen=True)
+class CaptureTelemetry:
+    """Represent the telemetry decoded from a capture, one column per field.
+
+    Rows are in capture order; ``packet_index`` is the position of each
+    telemetry packet among all packets of the capture.
+    """
+
+    packets: int  # number of packets in the capture, of any kind
+    packet_index: np.ndarray
+    data_format_version: np.ndarray
+    temperature: np.ndarray  # °C
+    gravity: np.ndarray  # SG
+    gravity_velocity: np.ndarray  # NaN where the Pill reported it invalid
+    accelerometer_x: np.ndarray  # g
+    accelerometer_y: np.ndarray  # g
+    accelerometer_z: np.ndarray  # g
+    battery: np.ndarray  # %
+
+    def __len__(self) -> int:
+        """Return the number of telemetry packets."""
+        return len(self.packet_index)
+
+
+def _import_numpy():
+    """Import NumPy, which is only needed to decode captures."""
+    try:
+        import numpy
+    except ImportError as err:
+        raise RuntimeError("Decoding captures requires NumPy") from err
+    return numpy
+
+
+def _split_packets(buffer: bytes | memoryview) -> tuple[array, array]:
+    """Return the start offsets and lengths of the frames in a capture."""
+    starts = array("q")
+    lengths = array("q")
+    position = 0
+    end = len(buffer)
+    while position + 2 <= end:
+        length = (buffer[position] << 8) | buffer[position + 1]
+        position += 2
+        if position + length > end:
+            _LOGGER.warning(
+                "Capture ends inside a packet at offset %d; ignoring the rest",
+                position - 2,
+            )
+            break
+        starts.append(position)
+        lengths.append(length)
+        position += length
+    return starts, lengths
+
+
+def _gather(np, raw: np.ndarray, starts: np.ndarray, fields: list) -> np.ndarray:
+    """Read one record of a structured layout at each start offset."""
+    dtype = np.dtype(fields)
+    rows = raw[starts[:, None] + np.arange(dtype.itemsize)]
+    return np.ascontiguousarray(rows).view(dtype)[:, 0]
+
+
+def decode_capture(buffer: bytes | bytearray | memoryview) -> CaptureTelemetry:
+    """Decode every v1 and v2 telemetry packet of a capture.
+
+    Like the live parser, RAPT telemetry with another version byte is
+    decoded with the v1 layout. Other packets are skipped.
+    """
+    np = _import_numpy()
+    buffer = memoryview(buffer).cast("B")
+    split_starts, split_lengths = _split_packets(buffer)
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    starts = np.frombuffer(split_starts, dtype=np.int64)
+    lengths = np.frombuffer(split_lengths, dtype=np.int64)
+    packets = len(starts)
+
+    # Frames long enough for a prefix and version byte that start with RAPT
+    index = np.flatnonzero(lengths > TELEMETRY_OFFSET)
+    prefix = raw[starts[index, None] + np.arange(TELEMETRY_OFFSET)]
+    index = index[(prefix == np.frombuffer(RAPT_PREFIX, dtype=np.uint8)).all(axis=1)]
+    version = raw[starts[index] + TELEMETRY_OFFSET]
+    frame_lengths = lengths[index]
+
+    v2_index = index[
+        (version == 2) & (frame_lengths >= TELEMETRY_OFFSET + TELEMETRY_V2.size)
+    ]
+    v1_index = index[
+        (version != 2)
+        & (version != DEVICE_TYPE_VERSION)
+        & (frame_lengths >= TELEMETRY_OFFSET + TELEMETRY_V1.size)
+    ]
+    v1 = _gather(np, raw, starts[v1_index] + TELEMETRY_OFFSET, _V1_FIELDS)
+    v2 = _gather(np, raw, starts[v2_index] + TELEMETRY_OFFSET, _V2_FIELDS)
+
+    order = np.argsort(np.concatenate([v1_index, v2_index]), kind="stable")
+
+    def column(name: str) -> np.ndarray:
+        return np.concatenate([v1[name], v2[name]])[order]
+
+    velocity = np.concatenate([
+        np.full(len(v1), np.nan),
+        np.where(v2["velocity_valid"] == 1, v2["velocity"].astype(np.float64), np.nan),
+    ])[order]
+
+    return CaptureTelemetry(
+        packets=packets,
+        packet_index=np.concatenate([v1_index, v2_index])[order],
+        data_format_version=column("version"),
+        temperature=temperature_from_raw(column("temperature").astype(np.float64)),
+        gravity=gravity_from_raw(column("gravity").astype(np.float64)),
+        gravity_velocity=velocity,
+        accelerometer_x=acceleration_from_raw(column("accelerometer_x").astype(np.float64)),
+        accelerometer_y=acceleration_from_raw(column("accelerometer_y").astype(np.float64)),
+        accelerometer_z=acceleration_from_raw(column("accelerometer_z").astype(np.float64)),
+        battery=battery_from_raw(column("battery").astype(np.int64)),
+    )
+
+
+def decode_capture_file(path: str | os.PathLike[str]) -> CaptureTelemetry:
+    """Decode a capture file; this does blocking I/O."""
+    with open(path, "rb") as file:
+        return decode_capture(file.read())
@@ -20,8 +20,29 @@ from .const import (
     CONF_TEMPERATURE_ENTITY,
     CONF_BATTERY_ENTITY,
     CONF_SIGNAL_ENTITY,
+    CONF_SAVE_DELAY,
+    CONF_GRAVITY_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_HEARTBEAT,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_GRAVITY_PROCESS_NOISE,
+    CONF_GRAVITY_MEASUREMENT_NOISE,
+    CONF_TEMPERATURE_PROCESS_NOISE,
+    CONF_TEMPERATURE_MEASUREMENT_NOISE,
+    CONF_STORAGE_BACKEND,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_GRAVITY_DEADBAND,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_HEARTBEAT,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_GRAVITY_PROCESS_NOISE,
+    DEFAULT_GRAVITY_MEASUREMENT_NOISE,
+    DEFAULT_TEMPERATURE_PROCESS_NOISE,
+    DEFAULT_TEMPERATURE_MEASUREMENT_NOISE,
     SOURCE_TYPE_BLUETOOTH,
     SOURCE_TYPE_ENTITY,
+    STORAGE_BACKEND_STORE,
+    STORAGE_BACKEND_SQLITE,
 )
 
 # BLE constants for discovery
@@ -87,7 +108,7 @@ def _entity_schema(defaults: dict[str, Any] | None = None) -> vol.Schema:
 class RAPTBrewingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for RAPT Brewing."""
 
-    VERSION = 2
+    VERSION = 3
 
     @staticmethod
     def async_get_options_flow(config_entry):
@@ -247,7 +268,7 @@ class RAPTBrewingOptionsFlow(config_entries.OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Choose what to configure."""
-        menu = ["notifications"]
+        menu = ["notifications", "storage", "filters"]
         if self.config_entry.data.get(CONF_SOURCE_TYPE) == SOURCE_TYPE_ENTITY:
             menu.append("entities")
         return self.async_show_menu(step_id="init", menu_options=menu)
@@ -257,7 +278,9 @@ class RAPTBrewingOptionsFlow(config_entries.OptionsFlow):
     ) -> FlowResult:
         """Manage notification options."""
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            return self.async_create_entry(
+                title="", data={**self.config_entry.options, **user_input}
+            )
 
         notification_services = await self._get_notification_services()
 
@@ -276,6 +299,93 @@ class RAPTBrewingOptionsFlow(config_entries.OptionsFlow):
             }
         )
 
+    async def async_step_storage(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage how session readings are recorded and written to storage."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title="", data={**self.config_entry.options, **user_input}
+            )
+
+        options_schema = vol.Schema({
+            vol.Optional(
+                CONF_SAVE_DELAY,
+                default=self.config_entry.options.get(CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY)
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),
+            vol.Optional(
+                CONF_GRAVITY_DEADBAND,
+                default=self.config_entry.options.get(
+                    CONF_GRAVITY_DEADBAND, DEFAULT_GRAVITY_DEADBAND
+                )
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.0001, max=0.01)),
+            vol.Optional(
+                CONF_TEMPERATURE_DEADBAND,
+                default=self.config_entry.options.get(
+                    CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND
+                )
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.01, max=5.0)),
+            vol.Optional(
+                CONF_HEARTBEAT,
+                default=self.config_entry.options.get(CONF_HEARTBEAT, DEFAULT_HEARTBEAT)
+            ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+            vol.Optional(
+                CONF_MIN_UPDATE_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
+                )
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+            vol.Optional(
+                CONF_STORAGE_BACKEND,
+                default=self.config_entry.options.get(
+                    CONF_STORAGE_BACKEND, STORAGE_BACKEND_STORE
+                )
+            ): vol.In({
+                STORAGE_BACKEND_STORE: "JSON files (.storage)",
+                STORAGE_BACKEND_SQLITE: "SQLite database",
+            }),
+        })
+
+        return self.async_show_form(step_id="storage", data_schema=options_schema)
+
+    async def async_step_filters(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the noise filters of gravity and temperature readings."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title="", data={**self.config_entry.options, **user_input}
+            )
+
+        options_schema = vol.Schema({
+            vol.Optional(
+                CONF_GRAVITY_PROCESS_NOISE,
+                default=self.config_entry.options.get(
+                    CONF_GRAVITY_PROCESS_NOISE, DEFAULT_GRAVITY_PROCESS_NOISE
+                )
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.0001, max=0.1)),
+            vol.Optional(
+                CONF_GRAVITY_MEASUREMENT_NOISE,
+                default=self.config_entry.options.get(
+                    CONF_GRAVITY_MEASUREMENT_NOISE, DEFAULT_GRAVITY_MEASUREMENT_NOISE
+                )
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=0.01)),
+            vol.Optional(
+                CONF_TEMPERATURE_PROCESS_NOISE,
+                default=self.config_entry.options.get(
+                    CONF_TEMPERATURE_PROCESS_NOISE, DEFAULT_TEMPERATURE_PROCESS_NOISE
+                )
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.01, max=20.0)),
+            vol.Optional(
+                CONF_TEMPERATURE_MEASUREMENT_NOISE,
+                default=self.config_entry.options.get(
+                    CONF_TEMPERATURE_MEASUREMENT_NOISE, DEFAULT_TEMPERATURE_MEASUREMENT_NOISE
+                )
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=5.0)),
+        })
+
+        return self.async_show_form(step_id="filters", data_schema=options_schema)
+
     async def async_step_entities(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -8,6 +8,32 @@ DOMAIN: Final = "rapt_brewing"
 # Default values
 DEFAULT_SCAN_INTERVAL: Final = 60
 DEFAULT_SESSION_TIMEOUT: Final = 24 * 60 * 60  # 24 hours
+DEFAULT_SAVE_DELAY: Final = 60  # seconds between writes to storage
+
+# Data point retention: full resolution for recent readings, then per-minute
+# and finally per-hour min/mean/max aggregates
+RETENTION_RAW_SECONDS: Final = 24 * 60 * 60  # 24 hours at full resolution
+RETENTION_RAW_MAX_POINTS: Final = 10000  # hard cap on full-resolution points
+RETENTION_MINUTE_SECONDS: Final = 7 * 24 * 60 * 60  # 7 days of minute buckets
+RETENTION_EVICT_SECONDS: Final = 60 * 60  # evict in blocks of one hour...
+RETENTION_EVICT_POINTS: Final = 1000  # ...or of this many points
+
+# Reading compression: only store readings that cannot be interpolated
+DEFAULT_GRAVITY_DEADBAND: Final = 0.0005  # SG
+DEFAULT_TEMPERATURE_DEADBAND: Final = 0.2  # °C
+DEFAULT_HEARTBEAT: Final = 60 * 60  # store at least one reading per hour
+
+# Bluetooth push updates: minimum spacing between updates driven by advertisements
+DEFAULT_MIN_UPDATE_INTERVAL: Final = 5  # seconds
+# Entity source: state changes within this window make up one reading
+ENTITY_COALESCE_SECONDS: Final = 1.0
+
+# Noise filters: a rolling median, then a Kalman filter, per reading channel
+FILTER_MEDIAN_WINDOW: Final = 5  # readings
+DEFAULT_GRAVITY_PROCESS_NOISE: Final = 0.002  # SG per √hour
+DEFAULT_GRAVITY_MEASUREMENT_NOISE: Final = 0.001  # SG
+DEFAULT_TEMPERATURE_PROCESS_NOISE: Final = 0.5  # °C per √hour
+DEFAULT_TEMPERATURE_MEASUREMENT_NOISE: Final = 0.1  # °C
 
 # Entity IDs
 ENTITY_ID_SESSION_STATUS: Final = "session_status"
@@ -61,6 +87,20 @@ CONF_GRAVITY_ENTITY: Final = "gravity_entity"
 CONF_TEMPERATURE_ENTITY: Final = "temperature_entity"
 CONF_BATTERY_ENTITY: Final = "battery_entity"
 CONF_SIGNAL_ENTITY: Final = "signal_entity"
+CONF_SAVE_DELAY: Final = "save_delay"
+CONF_GRAVITY_DEADBAND: Final = "gravity_deadband"
+CONF_TEMPERATURE_DEADBAND: Final = "temperature_deadband"
+CONF_HEARTBEAT: Final = "heartbeat"
+CONF_MIN_UPDATE_INTERVAL: Final = "min_update_interval"
+CONF_GRAVITY_PROCESS_NOISE: Final = "gravity_process_noise"
+CONF_GRAVITY_MEASUREMENT_NOISE: Final = "gravity_measurement_noise"
+CONF_TEMPERATURE_PROCESS_NOISE: Final = "temperature_process_noise"
+CONF_TEMPERATURE_MEASUREMENT_NOISE: Final = "temperature_measurement_noise"
+CONF_STORAGE_BACKEND: Final = "storage_backend"
+
+# Storage backends
+STORAGE_BACKEND_STORE: Final = "store"
+STORAGE_BACKEND_SQLITE: Final = "sqlite"
 
 # Data source types
 SOURCE_TYPE_BLUETOOTH: Final = "bluetooth"
@@ -68,6 +108,7 @@ SOURCE_TYPE_ENTITY: Final = "entity"
 
 # Default alert thresholds
 DEFAULT_STUCK_FERMENTATION_HOURS: Final = 48
+STUCK_FERMENTATION_GRAVITY_BAND: Final = 0.005  # SG change that counts as progress
 DEFAULT_TEMPERATURE_HIGH_THRESHOLD: Final = 30.0  # Celsius
 DEFAULT_TEMPERATURE_LOW_THRESHOLD: Final = 10.0  # Celsius
 DEFAULT_LOW_BATTERY_THRESHOLD: Final = 20  # Percentage
@@ -77,4 +118,18 @@ FERMENTATION_RATE_VIGOROUS: Final = 0.0008  # >19 points/day - peak fermentation
 FERMENTATION_RATE_ACTIVE: Final = 0.0004    # >10 points/day - good fermentation  
 FERMENTATION_RATE_MODERATE: Final = 0.0001  # >2 points/day - steady progress
 FERMENTATION_RATE_SLOW: Final = 0.00004     # >1 point/day - slow but progressing
-FERMENTATION_RATE_STUCK: Final = 0.00004    # ≤1 point/day - effectively stalled
\ No newline at end of file
+FERMENTATION_RATE_STUCK: Final = 0.00004    # ≤1 point/day - effectively stalled
+
+# Time window of the least-squares fermentation rate
+FERMENTATION_RATE_WINDOW: Final = 6 * 60 * 60  # seconds
+
+# Unfiltered readings kept for device stability and fermentation activity
+RECENT_READINGS_WINDOW: Final = 60 * 60  # seconds
+RECENT_READINGS_MAX: Final = 720  # one hour at the default minimum update interval
+
+# Session data export
+SERVICE_EXPORT_SESSION_DATA: Final = "export_session_data"
+EXPORT_DIR: Final = "rapt_brewing_exports"  # under the config directory
+EXPORT_CHUNK_ROWS: Final = 1000  # rows formatted and written at a time
+EXPORT_FORMAT_CSV: Final = "csv"
+EXPORT_FORMAT_JSON: Final = "json"
\ No newline at end of file
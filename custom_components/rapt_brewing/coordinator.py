@@ -1,16 +1,19 @@
 """Coordinator for RAPT Brewing integration."""
 from __future__ import annotations
 
+from collections import deque
 import json
 import logging
+import time
 from datetime import datetime, timedelta
 import homeassistant.util.dt as dt_util
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, Event, EventStateChangedData, callback
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import HomeAssistant, Event, EventStateChangedData, State, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.components.bluetooth import BluetoothServiceInfoBleak
 
@@ -22,7 +25,28 @@ if TYPE_CHECKING:
 from .const import (
     DOMAIN,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SAVE_DELAY,
+    DEFAULT_GRAVITY_DEADBAND,
+    DEFAULT_TEMPERATURE_DEADBAND,
+    DEFAULT_HEARTBEAT,
+    DEFAULT_MIN_UPDATE_INTERVAL,
+    DEFAULT_GRAVITY_PROCESS_NOISE,
+    DEFAULT_GRAVITY_MEASUREMENT_NOISE,
+    DEFAULT_TEMPERATURE_PROCESS_NOISE,
+    DEFAULT_TEMPERATURE_MEASUREMENT_NOISE,
+    ENTITY_COALESCE_SECONDS,
+    FILTER_MEDIAN_WINDOW,
     CONF_RAPT_DEVICE_ID,
+    CONF_SAVE_DELAY,
+    CONF_GRAVITY_DEADBAND,
+    CONF_TEMPERATURE_DEADBAND,
+    CONF_HEARTBEAT,
+    CONF_MIN_UPDATE_INTERVAL,
+    CONF_GRAVITY_PROCESS_NOISE,
+    CONF_GRAVITY_MEASUREMENT_NOISE,
+    CONF_TEMPERATURE_PROCESS_NOISE,
+    CONF_TEMPERATURE_MEASUREMENT_NOISE,
+    CONF_STORAGE_BACKEND,
     CONF_NOTIFICATION_SERVICE,
     CONF_SOURCE_TYPE,
     CONF_GRAVITY_ENTITY,
@@ -31,6 +55,8 @@ from .const import (
     CONF_SIGNAL_ENTITY,
     SOURCE_TYPE_BLUETOOTH,
     SOURCE_TYPE_ENTITY,
+    STORAGE_BACKEND_SQLITE,
+    STORAGE_BACKEND_STORE,
     SESSION_STATE_ACTIVE,
     SESSION_STATE_IDLE,
     ALERT_TYPE_STUCK_FERMENTATION,
@@ -39,22 +65,39 @@ from .const import (
     ALERT_TYPE_FERMENTATION_COMPLETE,
     ALERT_TYPE_LOW_BATTERY,
     DEFAULT_STUCK_FERMENTATION_HOURS,
+    STUCK_FERMENTATION_GRAVITY_BAND,
     DEFAULT_TEMPERATURE_HIGH_THRESHOLD,
     DEFAULT_TEMPERATURE_LOW_THRESHOLD,
     DEFAULT_LOW_BATTERY_THRESHOLD,
     FERMENTATION_RATE_STUCK,
+    FERMENTATION_RATE_WINDOW,
     FERMENTATION_RATE_SLOW,
+    RECENT_READINGS_MAX,
+    RECENT_READINGS_WINDOW,
+)
+from .analysis import (
+    FilterPipeline,
+    GravityBandTracker,
+    KalmanFilter,
+    RegressionFit,
+    RollingMedian,
+    RollingRegression,
+)
+from .data import RAPTBrewingData, BrewingSession, DataPoint, Alert, SessionTimeSeries
+from .ingest import ReadingCompressor
+from .snapshot import SessionSnapshot
+from .sqlite_storage import RAPTBrewingSQLiteStorage
+from .storage import (
+    JOURNALED_SESSION_FIELDS,
+    RAPTBrewingStorage,
+    entry_storage_key,
 )
-from .data import RAPTBrewingData, BrewingSession, DataPoint, Alert
 
 if TYPE_CHECKING:
     from homeassistant.helpers.entity_registry import EntityRegistry
 
 _LOGGER = logging.getLogger(__name__)
 
-STORAGE_VERSION = 1
-STORAGE_KEY = "rapt_brewing_sessions"
-
 
 class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
     """Coordinator for RAPT Brewing integration."""
@@ -68,17 +111,70 @@ class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
         )
         self.entry = entry
-        self.store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self.storage_backend = entry.options.get(
+            CONF_STORAGE_BACKEND, STORAGE_BACKEND_STORE
+        )
+        self.storage: RAPTBrewingStorage | RAPTBrewingSQLiteStorage
+        if self.storage_backend == STORAGE_BACKEND_SQLITE:
+            self.storage = RAPTBrewingSQLiteStorage(
+                hass, entry_storage_key(entry.entry_id)
+            )
+        else:
+            self.storage = RAPTBrewingStorage(hass, entry_storage_key(entry.entry_id))
         self.data = RAPTBrewingData()
         self._source_type = entry.data.get(CONF_SOURCE_TYPE, SOURCE_TYPE_BLUETOOTH)
         self._rapt_device_id = entry.data.get(CONF_RAPT_DEVICE_ID)
         self._ble_cancel_callback = None
+        self._update_debouncer: Debouncer | None = None
         self._entity_cancel_callback = None
+        self._entity_data: RAPTPillSensorData | None = None
         self._signal_strength: int | None = None
         self.ble_device_data = None
 
+        # Persistence: archived session summaries are serialized once and
+        # reused until the session is marked dirty again
+        self._dirty_sessions: set[str] = set()
+        self._session_dicts: dict[str, dict[str, Any]] = {}
+        self._unsub_final_write = hass.bus.async_listen(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_handle_final_write
+        )
+
         # Current sensor data (BLE or entity-derived)
         self._current_ble_data: Any = None
+        # Sequence number of the telemetry last recorded into the current
+        # session; sensor data starts at 0 until its first telemetry
+        self._recorded_sequence = 0
+        # Device log entries of the current session already in storage
+        self._journaled_device_log_length = 0
+        # Decides which readings of the current session are stored; the
+        # latest reading is kept for the sensors even when it is not stored
+        self._compressor = ReadingCompressor()
+        self.latest_data_point: DataPoint | None = None
+        # Latest readings as received, stored or not
+        self._recent_points: deque[DataPoint] = deque(maxlen=RECENT_READINGS_MAX)
+        # Noise filters of the readings; their output drives the session's
+        # current values, derived values and alerts, while stored readings
+        # stay raw. Noise levels are applied from the options per reading.
+        self._gravity_kalman = KalmanFilter(
+            DEFAULT_GRAVITY_PROCESS_NOISE, DEFAULT_GRAVITY_MEASUREMENT_NOISE
+        )
+        self._temperature_kalman = KalmanFilter(
+            DEFAULT_TEMPERATURE_PROCESS_NOISE, DEFAULT_TEMPERATURE_MEASUREMENT_NOISE
+        )
+        self._gravity_filter = FilterPipeline(
+            RollingMedian(FILTER_MEDIAN_WINDOW), self._gravity_kalman
+        )
+        self._temperature_filter = FilterPipeline(
+            RollingMedian(FILTER_MEDIAN_WINDOW), self._temperature_kalman
+        )
+        self._filtered_temperature: float | None = None
+        # Least-squares fermentation rate over every reading in the window
+        self._rate_estimator = RollingRegression(FERMENTATION_RATE_WINDOW)
+        self.fermentation_rate_fit: RegressionFit | None = None
+        # When gravity last moved out of the stuck-fermentation band
+        self._gravity_band = GravityBandTracker()
+        # Sensor values derived once per update and shared by all sensors
+        self.snapshot = SessionSnapshot()
 
         if self._source_type == SOURCE_TYPE_ENTITY:
             self._setup_entity_source()
@@ -106,21 +202,36 @@ class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
 
         _LOGGER.warning("RAPT COORDINATOR: Starting BLE coordinator for device: %s", self._rapt_device_id)
 
-        from homeassistant.components.bluetooth import async_register_callback
-
-        def ble_callback(service_info: BluetoothServiceInfoBleak, change: str) -> None:
-            _LOGGER.warning("ESPHome BLE CALLBACK: Device %s, Change: %s, Manufacturers: %s",
-                           service_info.address, change, list(service_info.manufacturer_data.keys()))
-            if service_info.address == self._rapt_device_id:
-                self.ble_device_data._async_handle_bluetooth_data_update(service_info)
+        from .ble_dispatch import async_get_dispatcher
 
-        self._ble_cancel_callback = async_register_callback(
+        # New telemetry is pushed to the entities right away; advertisements
+        # arriving within the minimum update interval after that are
+        # coalesced into one update at the end of the interval
+        self._update_debouncer = Debouncer(
             hass,
-            ble_callback,
-            {"address": self._rapt_device_id},
-            "advertisement",
+            _LOGGER,
+            cooldown=self._min_update_interval(),
+            immediate=True,
+            function=self.async_refresh,
+        )
+
+        @callback
+        def ble_callback(service_info: BluetoothServiceInfoBleak) -> None:
+            previous = self._telemetry_sequence()
+            self.ble_device_data._async_handle_bluetooth_data_update(service_info)
+            if self._telemetry_sequence() != previous:
+                self._update_debouncer.cooldown = self._min_update_interval()
+                self._update_debouncer.async_schedule_call()
+
+        self._ble_cancel_callback = async_get_dispatcher(hass).async_register(
+            self._rapt_device_id, ble_callback
         )
-        _LOGGER.warning("RAPT COORDINATOR: Registered ESPHome BLE callback for device: %s", self._rapt_device_id)
+        _LOGGER.warning("RAPT COORDINATOR: Registered BLE callback for device: %s", self._rapt_device_id)
+
+    def _telemetry_sequence(self) -> int:
+        """Return the sequence number of the latest BLE telemetry."""
+        sensor_data = self.ble_device_data.get_last_sensor_data()
+        return sensor_data.sequence if sensor_data else 0
 
     def _setup_entity_source(self) -> None:
         """Wire up HA entity-based data ingestion."""
@@ -135,10 +246,19 @@ class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
         ]
         _LOGGER.warning("RAPT COORDINATOR: Entity source tracking: %s", tracked)
 
+        # A proxy updates several entities for one advertisement; changes
+        # within a short window are collected into a single reading
+        self._update_debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=ENTITY_COALESCE_SECONDS,
+            immediate=False,
+            function=self.async_refresh,
+        )
+
         @callback
         def _handle_entity_change(event: Event[EventStateChangedData]) -> None:
-            self._refresh_from_entities()
-            self.hass.async_create_task(self.async_request_refresh())
+            self._update_debouncer.async_schedule_call()
 
         self._entity_cancel_callback = async_track_state_change_event(
             self.hass, tracked, _handle_entity_change
@@ -148,41 +268,65 @@ class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
         """Build sensor data from the configured HA entities."""
         from .ble_device import RAPTPillSensorData
 
-        gravity = self._safe_float(
-            self._get_entity_state(self.entry.data.get(CONF_GRAVITY_ENTITY))
+        gravity_state = self._get_entity_state(self.entry.data.get(CONF_GRAVITY_ENTITY))
+        temperature_state = self._get_entity_state(
+            self.entry.data.get(CONF_TEMPERATURE_ENTITY)
         )
+        battery_state = self._get_entity_state(self.entry.data.get(CONF_BATTERY_ENTITY))
+        signal_state = self._get_entity_state(self.entry.data.get(CONF_SIGNAL_ENTITY))
+        gravity = self._safe_float(gravity_state.state if gravity_state else None)
         temperature = self._safe_float(
-            self._get_entity_state(self.entry.data.get(CONF_TEMPERATURE_ENTITY))
-        )
-        battery = self._safe_int(
-            self._get_entity_state(self.entry.data.get(CONF_BATTERY_ENTITY))
-        )
-        signal = self._safe_int(
-            self._get_entity_state(self.entry.data.get(CONF_SIGNAL_ENTITY))
+            temperature_state.state if temperature_state else None
         )
+        battery = self._safe_int(battery_state.state if battery_state else None)
+        signal = self._safe_int(signal_state.state if signal_state else None)
 
         if gravity is None and temperature is None and battery is None:
             self._current_ble_data = None
             self._signal_strength = signal
             return
 
-        self._current_ble_data = RAPTPillSensorData(
-            temperature=temperature,
-            gravity=gravity,
-            battery=battery,
-            signal_strength=signal,
+        # Merged into one object so its sequence only moves on a change
+        if self._entity_data is None:
+            self._entity_data = RAPTPillSensorData()
+        self._entity_data.merge(
+            RAPTPillSensorData(
+                temperature=temperature,
+                gravity=gravity,
+                battery=battery,
+                signal_strength=signal,
+                # The reading is as recent as the newest state it is built from
+                timestamp=max(
+                    state.last_updated.timestamp()
+                    for state in (gravity_state, temperature_state, battery_state, signal_state)
+                    if state is not None
+                ),
+            ),
+            ("temperature", "gravity", "battery", "signal_strength", "timestamp"),
         )
+        self._current_ble_data = self._entity_data
         self._signal_strength = signal
 
-    def _get_entity_state(self, entity_id: str | None) -> Any:
-        """Read the current state value of an entity."""
+    def _get_entity_state(self, entity_id: str | None) -> State | None:
+        """Read the current state of an entity."""
         if not entity_id:
             return None
-        state = self.hass.states.get(entity_id)
-        return state.state if state else None
+        return self.hass.states.get(entity_id)
         
+    def _min_update_interval(self) -> float:
+        """Return the configured minimum spacing of pushed BLE updates."""
+        return self.entry.options.get(
+            CONF_MIN_UPDATE_INTERVAL, DEFAULT_MIN_UPDATE_INTERVAL
+        )
+
     async def _async_update_data(self) -> RAPTBrewingData:
-        """Update data from integrated BLE device."""
+        """Update data from integrated BLE device.
+
+        In Bluetooth mode new telemetry is pushed by the advertisement
+        callback; the regular poll only acts as a watchdog that picks up
+        telemetry the callback did not see and refreshes time-derived values.
+        A reading is recorded once, and only when its telemetry changed.
+        """
         try:
             if self._source_type == SOURCE_TYPE_ENTITY:
                 self._refresh_from_entities()
@@ -193,24 +337,49 @@ class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
                            self._current_ble_data.to_dict() if self._current_ble_data else "None")
             
             if self._current_ble_data and self.data.current_session:
+                session = self.data.current_session
+                alert_count = len(session.alerts)
+
                 # Update current session with new BLE data
-                await self._update_current_session_ble(self._current_ble_data)
+                data_points: list[DataPoint] = []
+                if self._current_ble_data.sequence != self._recorded_sequence:
+                    data_points = await self._update_current_session_ble(self._current_ble_data)
+                    self._recorded_sequence = self._current_ble_data.sequence
                 
                 # Check for alerts
                 await self._check_alerts_ble(self._current_ble_data)
                 
-                # Save data to storage
-                await self._save_data()
+                # Journal the reading; new alerts need a snapshot and a full
+                # journal is folded into one right away
+                if len(session.alerts) != alert_count:
+                    self.async_schedule_save(session)
+                if self.storage.needs_compaction:
+                    await self._save_data()
+                else:
+                    self._journal_data_points(session, data_points)
             elif not self._current_ble_data:
                 _LOGGER.debug("RAPT COORDINATOR: No BLE data available")
             elif not self.data.current_session:
                 _LOGGER.debug("RAPT COORDINATOR: No current session")
-            
+
+            self._update_snapshot()
             return self.data
             
         except Exception as err:
             raise UpdateFailed(f"Error updating RAPT brewing data: {err}") from err
     
+    def _update_snapshot(self) -> None:
+        """Derive the sensor values of the current session."""
+        session = self.data.current_session
+        self.snapshot = SessionSnapshot.build(
+            self.snapshot.version + 1,
+            session,
+            self.latest_data_point,
+            self._get_temperature_corrected_gravity(session) if session else None,
+            self.fermentation_rate_fit,
+            self._recent_points,
+        )
+
     def get_current_ble_data(self) -> Any:
         """Get current BLE sensor data."""
         return self._current_ble_data
@@ -222,57 +391,111 @@ class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
         service_info = self.ble_device_data.get_last_service_info()
         return service_info.rssi if service_info else None
     
-    async def _update_current_session_ble(self, ble_data: Any) -> None:
-        """Update current session with new BLE data."""
+    async def _update_current_session_ble(self, ble_data: Any) -> list[DataPoint]:
+        """Update current session with new BLE data and return the stored data points."""
         if not self.data.current_session:
-            return
+            return []
             
         session = self.data.current_session
-        now = dt_util.now()
         
         # Get signal strength from BLE service info
         signal_strength = self.get_ble_signal_strength()
         
-        # Add data point
+        # Readings taken from entities carry the time of their states; they
+        # never go back before the previous reading
+        timestamp = ble_data.timestamp or time.time()
+        if self.latest_data_point is not None:
+            timestamp = max(timestamp, self.latest_data_point.timestamp)
+
+        # Add data point, unless it can be interpolated from stored ones
         data_point = DataPoint(
-            timestamp=now,
+            timestamp=timestamp,
             gravity=ble_data.gravity,
             temperature=ble_data.temperature,
             battery_level=ble_data.battery,
             signal_strength=signal_strength,
+            gravity_velocity=ble_data.gravity_velocity,
+            accelerometer_x=ble_data.accelerometer_x,
+            accelerometer_y=ble_data.accelerometer_y,
+            accelerometer_z=ble_data.accelerometer_z,
+            firmware_version=ble_data.firmware_version,
+            device_type=ble_data.device_type,
+            data_format_version=ble_data.data_format_version,
+        )
+        self.latest_data_point = data_point
+        self._recent_points.append(data_point)
+        self._configure_filters()
+        gravity, temperature = self._filter_reading(data_point)
+        corrected_gravity = self._apply_temp_correction_to_filtered(gravity, temperature)
+        if corrected_gravity is not None:
+            self._rate_estimator.add(data_point.timestamp, corrected_gravity)
+        if gravity:
+            self._gravity_band.add(data_point.timestamp, gravity)
+        data_points = self._compressor.add(
+            data_point,
+            self.entry.options.get(CONF_GRAVITY_DEADBAND, DEFAULT_GRAVITY_DEADBAND),
+            self.entry.options.get(CONF_TEMPERATURE_DEADBAND, DEFAULT_TEMPERATURE_DEADBAND),
+            self.entry.options.get(CONF_HEARTBEAT, DEFAULT_HEARTBEAT),
         )
-        session.data_points.append(data_point)
+        for stored_point in data_points:
+            session.data_points.append(stored_point)
         
-        # Update current values
-        if ble_data.gravity is not None:
-            session.current_gravity = ble_data.gravity
+        # Update current values from the filtered readings
+        if gravity is not None:
+            session.current_gravity = gravity
             
             # Auto-set original gravity if not set and this is the first gravity reading
             # Use temperature-corrected gravity for more accurate OG measurement
             if session.original_gravity is None and len(session.data_points) <= 1:
-                # Apply temperature correction to the raw gravity reading
-                corrected_og = self._apply_temp_correction_to_gravity(ble_data.gravity, ble_data.temperature)
-                session.original_gravity = corrected_og if corrected_og else ble_data.gravity
+                # Apply temperature correction to the filtered gravity reading
+                corrected_og = self._apply_temp_correction_to_gravity(gravity, temperature)
+                session.original_gravity = corrected_og if corrected_og else gravity
                 _LOGGER.warning("RAPT AUTO-SET: Original gravity set to %.3f (temp corrected from %.3f) for session: %s", 
-                               session.original_gravity, ble_data.gravity, session.name)
+                               session.original_gravity, gravity, session.name)
                 
                 # Also set a reasonable default target gravity if not set
                 # Typical beer fermentation: OG - 0.020 to 0.030 points
                 if session.target_gravity is None:
-                    session.target_gravity = max(0.990, ble_data.gravity - 0.025)
+                    session.target_gravity = max(0.990, gravity - 0.025)
                     _LOGGER.warning("RAPT AUTO-SET: Target gravity set to %.3f for session: %s", 
                                    session.target_gravity, session.name)
                 
-        if ble_data.temperature is not None:
-            session.current_temperature = ble_data.temperature
+        if temperature is not None:
+            session.current_temperature = temperature
             
         # Calculate derived values
         self._calculate_derived_values(session)
         
-        # Limit data points to prevent unlimited growth
-        if len(session.data_points) > 10000:
-            session.data_points = session.data_points[-10000:]
+        # Older readings are downsampled by the session's retention tiers
+        return data_points
     
+    def _configure_filters(self) -> None:
+        """Apply the noise levels of the options to the Kalman filters."""
+        options = self.entry.options
+        self._gravity_kalman.process_noise = options.get(
+            CONF_GRAVITY_PROCESS_NOISE, DEFAULT_GRAVITY_PROCESS_NOISE
+        )
+        self._gravity_kalman.measurement_noise = options.get(
+            CONF_GRAVITY_MEASUREMENT_NOISE, DEFAULT_GRAVITY_MEASUREMENT_NOISE
+        )
+        self._temperature_kalman.process_noise = options.get(
+            CONF_TEMPERATURE_PROCESS_NOISE, DEFAULT_TEMPERATURE_PROCESS_NOISE
+        )
+        self._temperature_kalman.measurement_noise = options.get(
+            CONF_TEMPERATURE_MEASUREMENT_NOISE, DEFAULT_TEMPERATURE_MEASUREMENT_NOISE
+        )
+
+    def _filter_reading(self, data_point: DataPoint) -> tuple[float | None, float | None]:
+        """Pass a reading through the noise filters; return gravity and temperature."""
+        gravity = data_point.gravity
+        if gravity is not None:
+            gravity = self._gravity_filter.update(data_point.timestamp, gravity)
+        temperature = data_point.temperature
+        if temperature is not None:
+            temperature = self._temperature_filter.update(data_point.timestamp, temperature)
+            self._filtered_temperature = temperature
+        return gravity, temperature
+
     def _calculate_derived_values(self, session: BrewingSession) -> None:
         """Calculate derived values for the session."""
         # Get temperature-corrected gravity for more accurate calculations
@@ -322,22 +545,11 @@ class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
             _LOGGER.warning("RAPT CALC: Cannot calculate attenuation - OG=%s, CG_corrected=%s", 
                            session.original_gravity, corrected_gravity)
         
-        # Calculate fermentation rate using temperature-corrected gravity (FIXED)
-        if len(session.data_points) >= 2:
-            recent_points = [
-                dp for dp in session.data_points[-24:]  # Last 24 data points
-                if dp.gravity is not None and dp.temperature is not None
-            ]
-            if len(recent_points) >= 2:
-                time_diff = (recent_points[-1].timestamp - recent_points[0].timestamp).total_seconds() / 3600
-                if time_diff > 0:
-                    # Apply temperature correction to both points
-                    first_corrected = self._apply_temp_correction_to_point(recent_points[0])
-                    last_corrected = self._apply_temp_correction_to_point(recent_points[-1])
-                    
-                    if first_corrected is not None and last_corrected is not None:
-                        gravity_diff = last_corrected - first_corrected
-                        session.fermentation_rate = gravity_diff / time_diff
+        # Fermentation rate: least-squares slope of temperature-corrected
+        # gravity over the rate window
+        self.fermentation_rate_fit = self._rate_estimator.fit()
+        if self.fermentation_rate_fit is not None:
+            session.fermentation_rate = self.fermentation_rate_fit.rate
     
     def _get_temperature_corrected_gravity(self, session: BrewingSession) -> float | None:
         """Get temperature-corrected gravity for accurate calculations."""
@@ -365,12 +577,13 @@ class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
         
         return corrected_gravity
     
-    def _apply_temp_correction_to_point(self, data_point) -> float | None:
-        """Apply temperature correction to a single data point."""
-        if not data_point.gravity or not data_point.temperature:
+    def _apply_temp_correction_to_filtered(
+        self, gravity: float | None, temperature: float | None
+    ) -> float | None:
+        """Apply temperature correction to a filtered reading."""
+        if not gravity or not temperature:
             return None
-            
-        return self._apply_temp_correction_to_gravity(data_point.gravity, data_point.temperature)
+        return self._apply_temp_correction_to_gravity(gravity, temperature)
     
     def _apply_temp_correction_to_gravity(self, gravity: float, temperature: float) -> float | None:
         """Apply temperature correction to gravity and temperature values."""
@@ -399,39 +612,37 @@ class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
         
         # Check for stuck fermentation using scientifically accurate threshold
         if session.fermentation_rate is not None and abs(session.fermentation_rate) < FERMENTATION_RATE_STUCK:
-            if session.data_points:
-                last_significant_change = None
-                for dp in reversed(session.data_points):
-                    if dp.gravity and abs(dp.gravity - session.current_gravity) > 0.005:
-                        last_significant_change = dp.timestamp
-                        break
-                
-                if (last_significant_change and 
-                    (now - last_significant_change).total_seconds() > DEFAULT_STUCK_FERMENTATION_HOURS * 3600):
-                    await self._add_alert(
-                        session,
-                        ALERT_TYPE_STUCK_FERMENTATION,
-                        "Fermentation appears to be stuck - no gravity change in 48 hours"
-                    )
+            last_significant_change = self._gravity_band.last_outside(
+                STUCK_FERMENTATION_GRAVITY_BAND
+            )
+            if (last_significant_change and 
+                now.timestamp() - last_significant_change > DEFAULT_STUCK_FERMENTATION_HOURS * 3600):
+                await self._add_alert(
+                    session,
+                    ALERT_TYPE_STUCK_FERMENTATION,
+                    "Fermentation appears to be stuck - no gravity change in 48 hours"
+                )
         
-        # Check temperature alerts - only alert when conditions are concerning
-        if ble_data.temperature is not None:
+        # Check temperature alerts - only alert when conditions are concerning;
+        # the filtered temperature keeps a single noisy reading from alerting
+        temperature = self._filtered_temperature
+        if temperature is not None:
             # Hot temperature during active fermentation is concerning
-            if ble_data.temperature > DEFAULT_TEMPERATURE_HIGH_THRESHOLD:
+            if temperature > DEFAULT_TEMPERATURE_HIGH_THRESHOLD:
                 await self._add_alert(
                     session,
                     ALERT_TYPE_TEMPERATURE_HIGH,
-                    f"Temperature too high: {ble_data.temperature:.1f}°C"
+                    f"Temperature too high: {temperature:.1f}°C"
                 )
             # Cold temperature alert only if fermentation isn't near completion (cold crash expected)
-            elif ble_data.temperature < DEFAULT_TEMPERATURE_LOW_THRESHOLD:
+            elif temperature < DEFAULT_TEMPERATURE_LOW_THRESHOLD:
                 # Only alert if attenuation < 70% (early/mid fermentation)
                 # Cold crash at 70%+ attenuation is expected and normal
                 if session.attenuation is None or session.attenuation < 70.0:
                     await self._add_alert(
                         session,
                         ALERT_TYPE_TEMPERATURE_LOW,
-                        f"Temperature too low during fermentation: {ble_data.temperature:.1f}°C"
+                        f"Temperature too low during fermentation: {temperature:.1f}°C"
                     )
         
         # Check for fermentation completion
@@ -561,14 +772,34 @@ class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
         )
         
         self.data.add_session(session)
-        self.data.set_current_session(session_id)
+        await self.async_set_current_session(session_id)
         
         # Reset sensor values to create a clean break in history graphs
         await self._reset_sensor_values()
         
-        await self._save_data()
+        self.async_schedule_save(session)
         return session_id
     
+    async def async_set_current_session(self, session_id: str | None) -> None:
+        """Switch the session readings are recorded into.
+        
+        The reading held back by the compressor is stored in the outgoing
+        session, and the per-reading state continues from the stored points
+        of the incoming one, whose archive is loaded back into memory.
+        """
+        current = self.data.current_session
+        if (current.id if current else None) == session_id:
+            return
+        
+        self._store_held_reading()
+        session = self.data.get_session(session_id) if session_id else None
+        if session is not None and session.archived:
+            session.data_points = await self.async_get_session_data_points(session_id)
+            session.archived = False
+            self.async_schedule_save(session)
+        self.data.set_current_session(session_id)
+        self._reset_reading_state(self.data.current_session)
+    
     async def _reset_sensor_values(self) -> None:
         """Reset sensor values to create a clean break in history graphs when starting a new session."""
         if not self.data.current_session:
@@ -584,7 +815,7 @@ class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
         session.fermentation_rate = None
         
         # Clear data points to start fresh
-        session.data_points = []
+        session.data_points = SessionTimeSeries()
         session.alerts = []
         
         # Trigger a coordinator update to push None values to sensors
@@ -600,48 +831,199 @@ class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
             session.completed_at = dt_util.now()
             
             if self.data.current_session and self.data.current_session.id == session_id:
-                self.data.set_current_session(None)
+                await self.async_set_current_session(None)
             
-            await self._save_data()
+            await self._archive_session(session)
+            self.async_schedule_save(session)
     
     async def delete_session(self, session_id: str) -> None:
         """Delete a brewing session."""
         if self.data.current_session and self.data.current_session.id == session_id:
-            self.data.set_current_session(None)
+            await self.async_set_current_session(None)
+        
+        session = self.data.get_session(session_id)
+        if session and session.archived:
+            await self.storage.async_remove_archive(session_id)
         
         self.data.remove_session(session_id)
-        await self._save_data()
+        self._session_dicts.pop(session_id, None)
+        self.async_schedule_save()
     
-    async def _save_data(self) -> None:
-        """Save data to storage."""
-        data_to_save = {
-            "sessions": {
-                session_id: session.to_dict()
-                for session_id, session in self.data.sessions.items()
-            },
-            "current_session_id": self.data.current_session.id if self.data.current_session else None,
+    async def _archive_session(self, session: BrewingSession) -> None:
+        """Move the data points of a finished session out of memory into its archive."""
+        if session.archived:
+            return
+        await self.storage.async_save_archive(session.id, session.data_points)
+        session.archived = True
+        session.data_points = SessionTimeSeries()
+    
+    async def async_get_session_data_points(self, session_id: str) -> SessionTimeSeries | None:
+        """Return the data points of a session, reading archived ones from storage."""
+        session = self.data.get_session(session_id)
+        if session is None:
+            return None
+        if not session.archived:
+            return session.data_points
+        
+        data_points = await self.storage.async_load_archive(session_id)
+        if data_points is None:
+            _LOGGER.warning("RAPT SESSION: Archive missing for session: %s", session_id)
+            return SessionTimeSeries()
+        return data_points
+    
+    @property
+    def _save_delay(self) -> float:
+        """Return the configured persistence window in seconds."""
+        return self.entry.options.get(CONF_SAVE_DELAY, DEFAULT_SAVE_DELAY)
+    
+    @callback
+    def async_schedule_save(self, session: BrewingSession | None = None) -> None:
+        """Mark a session dirty and persist it within the save window."""
+        if session is not None:
+            self._dirty_sessions.add(session.id)
+        self.storage.async_delay_save(self._data_to_save, self._save_delay)
+    
+    def _data_to_save(self) -> dict[str, Any]:
+        """Build the snapshot, re-serializing only the sessions that changed."""
+        current_id = self.data.current_session.id if self.data.current_session else None
+        sessions: dict[str, dict[str, Any]] = {}
+        for session_id, session in self.data.sessions.items():
+            if session_id == current_id:
+                # The current session changes with every reading
+                sessions[session_id] = session.to_dict()
+                continue
+            cached = self._session_dicts.get(session_id)
+            if cached is None or session_id in self._dirty_sessions:
+                cached = self._session_dicts[session_id] = session.to_dict()
+            sessions[session_id] = cached
+        self._dirty_sessions.clear()
+        
+        return {
+            "sessions": sessions,
+            "current_session_id": current_id,
             "settings": self.data.settings,
         }
+    
+    @callback
+    def _journal_data_points(
+        self, session: BrewingSession, data_points: list[DataPoint]
+    ) -> None:
+        """Queue stored data points of the current session for the journal."""
+        if not data_points:
+            return
+        fields = {field: getattr(session, field) for field in JOURNALED_SESSION_FIELDS}
+        # The device log only goes into the journal when it gained an entry
+        device_log_length = len(session.data_points.device_log)
+        if device_log_length != self._journaled_device_log_length:
+            fields["device_log"] = session.data_points.device_log_to_dict()
+            self._journaled_device_log_length = device_log_length
+        for data_point in data_points:
+            self.storage.async_append(
+                session.id, data_point.to_dict(), fields, self._save_delay
+            )
+    
+    def _reset_reading_state(self, session: BrewingSession | None = None) -> None:
+        """Reset the per-reading state, continuing from a session's stored points."""
+        self._recorded_sequence = 0
+        self._journaled_device_log_length = (
+            len(session.data_points.device_log) if session is not None else 0
+        )
+        self._compressor.reset()
+        self._rate_estimator.clear()
+        self._gravity_band.clear()
+        self._gravity_filter.clear()
+        self._temperature_filter.clear()
+        self._filtered_temperature = None
+        self.latest_data_point = None
+        self._recent_points.clear()
+        self.fermentation_rate_fit = None
+        if session is None or not len(session.data_points):
+            return
         
-        await self.store.async_save(data_to_save)
+        self.latest_data_point = session.data_points[-1]
+        self._compressor.reset(self.latest_data_point)
+        
+        # Older history only survives as aggregates; their extremes are
+        # enough to know when gravity last left the stuck band
+        for tier in (session.data_points.hour, session.data_points.minute):
+            for bucket in tier:
+                if bucket.gravity_max is not None:
+                    self._gravity_band.add(bucket.start, bucket.gravity_max)
+                    self._gravity_band.add(bucket.start, bucket.gravity_min)
+        
+        for data_point in session.data_points:
+            if data_point.gravity:
+                self._gravity_band.add(data_point.timestamp, data_point.gravity)
+        
+        # Until new readings arrive, the stored ones stand in for the recent
+        self._recent_points.extend(
+            session.data_points.since(self.latest_data_point.timestamp - RECENT_READINGS_WINDOW)
+        )
+        
+        # The filters and the rate continue from the readings in the window
+        self._configure_filters()
+        for data_point in session.data_points.since(
+            self.latest_data_point.timestamp - FERMENTATION_RATE_WINDOW
+        ):
+            corrected_gravity = self._apply_temp_correction_to_filtered(
+                *self._filter_reading(data_point)
+            )
+            if corrected_gravity is not None:
+                self._rate_estimator.add(data_point.timestamp, corrected_gravity)
+        self.fermentation_rate_fit = self._rate_estimator.fit()
+    
+    @callback
+    def _store_held_reading(self) -> None:
+        """Store the reading held back by the compressor before stopping."""
+        session = self.data.current_session
+        if session is None:
+            return
+        held_point = self._compressor.flush()
+        if held_point is not None:
+            session.data_points.append(held_point)
+            self._journal_data_points(session, [held_point])
+    
+    async def _save_data(self) -> None:
+        """Save data to storage immediately."""
+        await self.storage.async_save(self._data_to_save)
+    
+    async def _async_handle_final_write(self, _event: Event) -> None:
+        """Write pending data before Home Assistant stops."""
+        self._store_held_reading()
+        await self.storage.async_flush()
     
     async def _load_data(self) -> None:
         """Load data from storage."""
-        stored_data = await self.store.async_load()
+        stored_data = await self.storage.async_load()
         
         if stored_data:
-            # Load sessions
+            current_session_id = stored_data.get("current_session_id")
+            moved_to_archive = False
+            
+            # Load sessions - only the current one with its data points,
+            # archived ones as summaries
             for session_id, session_data in stored_data.get("sessions", {}).items():
+                if session_id != current_session_id and not session_data.get("archived"):
+                    # Stored before archiving existed: move the points out once
+                    data_points = await self.hass.async_add_executor_job(
+                        lambda data=session_data: BrewingSession.from_dict(data).data_points
+                    )
+                    await self.storage.async_save_archive(session_id, data_points)
+                    session_data.pop("data_points", None)
+                    session_data["archived"] = True
+                    moved_to_archive = True
                 session = BrewingSession.from_dict(session_data)
                 self.data.add_session(session)
             
-            # Set current session
-            current_session_id = stored_data.get("current_session_id")
+            # Set current session and continue compressing from its last point
             if current_session_id:
-                self.data.set_current_session(current_session_id)
+                await self.async_set_current_session(current_session_id)
             
             # Load settings
             self.data.settings = stored_data.get("settings", {})
+            
+            if moved_to_archive:
+                await self._save_data()
     
     async def async_config_entry_first_refresh(self) -> None:
         """Perform first refresh."""
@@ -650,9 +1032,16 @@ class RAPTBrewingCoordinator(DataUpdateCoordinator[RAPTBrewingData]):
     
     async def async_shutdown(self) -> None:
         """Shutdown the coordinator."""
+        if self._unsub_final_write:
+            self._unsub_final_write()
+            self._unsub_final_write = None
+        self._store_held_reading()
+        await self.storage.async_close()
         if self._ble_cancel_callback:
             self._ble_cancel_callback()
             self._ble_cancel_callback = None
+        if self._update_debouncer:
+            self._update_debouncer.async_shutdown()
         if self._entity_cancel_callback:
             self._entity_cancel_callback()
             self._entity_cancel_callback = None
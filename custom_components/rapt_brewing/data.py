@@ -1,12 +1,24 @@
 """Data classes for RAPT Brewing integration."""
 from __future__ import annotations
 
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+import math
+import struct
+import sys
+from typing import Any, overload
+import zlib
 
 from .const import (
     FERMENTATION_STAGE_PRIMARY,
+    RETENTION_EVICT_POINTS,
+    RETENTION_EVICT_SECONDS,
+    RETENTION_MINUTE_SECONDS,
+    RETENTION_RAW_MAX_POINTS,
+    RETENTION_RAW_SECONDS,
     SESSION_STATE_IDLE,
 )
 
@@ -31,14 +43,17 @@ class BrewingSession:
     started_at: datetime | None = None
     completed_at: datetime | None = None
     notes: str | None = None
-    data_points: list[DataPoint] = field(default_factory=list)
+    data_points: SessionTimeSeries = field(default_factory=lambda: SessionTimeSeries())
     alerts: list[Alert] = field(default_factory=list)
     # Battery calibration tracking
     battery_calibrated: bool = False
+    # Archived sessions are kept as summaries; their data points live in a
+    # separate archive and are only loaded on demand
+    archived: bool = False
     
     def to_dict(self) -> dict[str, Any]:
-        """Convert to dictionary."""
-        return {
+        """Convert to dictionary (summary only for archived sessions)."""
+        data = {
             "id": self.id,
             "name": self.name,
             "recipe": self.recipe,
@@ -55,14 +70,31 @@ class BrewingSession:
             "started_at": self.started_at.isoformat() if self.started_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
             "notes": self.notes,
-            "data_points": [dp.to_dict() for dp in self.data_points],
             "alerts": [alert.to_dict() for alert in self.alerts],
             "battery_calibrated": self.battery_calibrated,
+            "archived": self.archived,
         }
+        if not self.archived:
+            data["data_points"] = [dp.to_dict() for dp in self.data_points]
+            data["data_tiers"] = self.data_points.tiers_to_dict()
+            data["device_log"] = self.data_points.device_log_to_dict()
+        return data
+    
+    def to_archive(self) -> bytes:
+        """Encode the data points in the compact binary archive format."""
+        return self.data_points.to_bytes()
+    
+    @classmethod
+    def from_archive(cls, data: dict[str, Any], archive: bytes) -> BrewingSession:
+        """Create a full session from its summary dictionary and archive."""
+        session = cls.from_dict({**data, "archived": False, "data_points": []})
+        session.data_points = SessionTimeSeries.from_bytes(archive)
+        return session
     
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> BrewingSession:
         """Create from dictionary."""
+        archived = data.get("archived", False)
         return cls(
             id=data["id"],
             name=data["name"],
@@ -80,42 +112,807 @@ class BrewingSession:
             started_at=datetime.fromisoformat(data["started_at"]) if data.get("started_at") else None,
             completed_at=datetime.fromisoformat(data["completed_at"]) if data.get("completed_at") else None,
             notes=data.get("notes"),
-            data_points=[DataPoint.from_dict(dp) for dp in data.get("data_points", [])],
+            data_points=SessionTimeSeries(
+                (
+                    DataPoint.from_dict(dp)
+                    for dp in ([] if archived else data.get("data_points", []))
+                ),
+                tiers=None if archived else data.get("data_tiers"),
+                device_log=None if archived else data.get("device_log"),
+            ),
             alerts=[Alert.from_dict(alert) for alert in data.get("alerts", [])],
             battery_calibrated=data.get("battery_calibrated", False),
+            archived=archived,
         )
 
 
-@dataclass
+# Readings of the Pill that are only stored when it reports them
+EXTENDED_READING_FIELDS = (
+    "gravity_velocity",
+    "accelerometer_x",
+    "accelerometer_y",
+    "accelerometer_z",
+)
+# Device fields that rarely change; a series keeps them as a log of changes
+DEVICE_METADATA_FIELDS = ("firmware_version", "device_type", "data_format_version")
+
+
+@dataclass(frozen=True)
 class DataPoint:
-    """Represent a data point in a brewing session."""
+    """Represent a data point in a brewing session.
+
+    ``timestamp`` is in epoch seconds; convert with
+    ``homeassistant.util.dt.utc_from_timestamp`` where a datetime is needed.
+    The device metadata fields are not part of ``to_dict``; a series stores
+    them once per change in its device log.
+    """
     
-    timestamp: datetime
+    timestamp: float
     gravity: float | None = None
     temperature: float | None = None
     battery_level: int | None = None
     signal_strength: int | None = None
+    gravity_velocity: float | None = None  # points per day
+    accelerometer_x: float | None = None  # g
+    accelerometer_y: float | None = None  # g
+    accelerometer_z: float | None = None  # g
+    firmware_version: str | None = None
+    device_type: str | None = None
+    data_format_version: int | None = None
     
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary."""
-        return {
-            "timestamp": self.timestamp.isoformat(),
+        data = {
+            "ts": self.timestamp,
             "gravity": self.gravity,
             "temperature": self.temperature,
             "battery_level": self.battery_level,
             "signal_strength": self.signal_strength,
         }
+        for key in EXTENDED_READING_FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                data[key] = value
+        return data
     
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> DataPoint:
         """Create from dictionary."""
+        timestamp = data.get("ts")
+        if timestamp is None:
+            # Stored before epoch timestamps
+            timestamp = datetime.fromisoformat(data["timestamp"]).timestamp()
         return cls(
-            timestamp=datetime.fromisoformat(data["timestamp"]),
+            timestamp=timestamp,
             gravity=data.get("gravity"),
             temperature=data.get("temperature"),
             battery_level=data.get("battery_level"),
             signal_strength=data.get("signal_strength"),
+            gravity_velocity=data.get("gravity_velocity"),
+            accelerometer_x=data.get("accelerometer_x"),
+            accelerometer_y=data.get("accelerometer_y"),
+            accelerometer_z=data.get("accelerometer_z"),
+        )
+
+
+@dataclass(frozen=True)
+class DeviceMetadata:
+    """Represent the device metadata in effect from ``timestamp`` on."""
+
+    timestamp: float
+    firmware_version: str | None = None
+    device_type: str | None = None
+    data_format_version: int | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "ts": self.timestamp,
+            "firmware_version": self.firmware_version,
+            "device_type": self.device_type,
+            "data_format_version": self.data_format_version,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DeviceMetadata:
+        """Create from dictionary."""
+        return cls(
+            timestamp=data["ts"],
+            firmware_version=data.get("firmware_version"),
+            device_type=data.get("device_type"),
+            data_format_version=data.get("data_format_version"),
+        )
+
+
+# Missing readings in the integer columns of SessionTimeSeries
+MISSING_INT = -(2**31)
+
+# Binary archive format: uncompressed header, then a zlib-compressed body.
+# Timestamps are an int64 first value plus fixed-width int32 deltas; each
+# reading column is a presence bitmap plus delta/zigzag varints of the
+# scaled values. The minute and hour aggregate tiers and the device log
+# follow the columns.
+ARCHIVE_MAGIC = b"RPTA"
+ARCHIVE_VERSION = 1
+_ARCHIVE_HEADER = struct.Struct(">4sBI")
+_ARCHIVE_FIRST_TIMESTAMP = struct.Struct(">q")
+_ARCHIVE_TIER_HEADER = struct.Struct(">I")
+# Device log entry: timestamp, data format version, then the lengths of the
+# UTF-8 firmware version and device type that follow (0 when unknown)
+_ARCHIVE_DEVICE_ENTRY = struct.Struct(">qiHH")
+# Fixed-point scales: gravity in milli-points (1e-6 SG), temperature in m°C,
+# gravity velocity in 1/1000 points per day, acceleration in 1/10000 g (exact
+# for the Pill's 1/16 g steps)
+_GRAVITY_SCALE = 1_000_000
+_TEMPERATURE_SCALE = 1_000
+_VELOCITY_SCALE = 1_000
+_ACCELERATION_SCALE = 10_000
+
+
+def _encode_timestamps(timestamps: Iterable[float]) -> bytes:
+    """Encode timestamps as an int64 first value plus int32 deltas."""
+    values = [round(ts) for ts in timestamps]
+    if not values:
+        return b""
+    deltas = array("i", (b - a for a, b in zip(values, values[1:])))
+    if sys.byteorder == "little":
+        deltas.byteswap()
+    return _ARCHIVE_FIRST_TIMESTAMP.pack(values[0]) + deltas.tobytes()
+
+
+def _decode_timestamps(body: bytes, offset: int, count: int, column: array) -> int:
+    """Decode timestamps written by _encode_timestamps; return the new offset."""
+    if not count:
+        return offset
+    (timestamp,) = _ARCHIVE_FIRST_TIMESTAMP.unpack_from(body, offset)
+    offset += _ARCHIVE_FIRST_TIMESTAMP.size
+    deltas = array("i")
+    deltas.frombytes(body[offset:offset + 4 * (count - 1)])
+    if sys.byteorder == "little":
+        deltas.byteswap()
+    offset += 4 * (count - 1)
+    column.append(timestamp)
+    for delta in deltas:
+        timestamp += delta
+        column.append(timestamp)
+    return offset
+
+
+def _encode_column(values: Iterable[float], scale: int) -> bytes:
+    """Encode a column as presence bitmap plus delta/zigzag varints."""
+    values = list(values)
+    present = bytearray((len(values) + 7) // 8)
+    encoded = bytearray()
+    previous = 0
+    for index, value in enumerate(values):
+        # NaN marks a missing float, MISSING_INT a missing integer
+        if value != value or value == MISSING_INT:
+            continue
+        present[index >> 3] |= 1 << (index & 7)
+        scaled = round(value * scale)
+        delta = scaled - previous
+        previous = scaled
+        zigzag = delta << 1 if delta >= 0 else (-delta << 1) - 1
+        while zigzag >= 0x80:
+            encoded.append((zigzag & 0x7F) | 0x80)
+            zigzag >>= 7
+        encoded.append(zigzag)
+    return bytes(present) + bytes(encoded)
+
+
+def _decode_column(
+    body: bytes, offset: int, count: int, column: array, scale: int, missing: float
+) -> int:
+    """Decode a column written by _encode_column into ``column``; return the new offset."""
+    bitmap = body[offset:offset + (count + 7) // 8]
+    offset += len(bitmap)
+    previous = 0
+    for index in range(count):
+        if not bitmap[index >> 3] & (1 << (index & 7)):
+            column.append(missing)
+            continue
+        zigzag = 0
+        shift = 0
+        while True:
+            byte = body[offset]
+            offset += 1
+            zigzag |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        previous += (zigzag >> 1) ^ -(zigzag & 1)
+        column.append(previous / scale if column.typecode == "d" else previous)
+    return offset
+
+
+def _encode_device_log(entries: Iterable[DeviceMetadata]) -> bytes:
+    """Encode a device log as a count plus one entry per change."""
+    entries = list(entries)
+    encoded = bytearray(_ARCHIVE_TIER_HEADER.pack(len(entries)))
+    for entry in entries:
+        firmware = (entry.firmware_version or "").encode("utf-8")
+        device_type = (entry.device_type or "").encode("utf-8")
+        encoded += _ARCHIVE_DEVICE_ENTRY.pack(
+            round(entry.timestamp),
+            MISSING_INT if entry.data_format_version is None else entry.data_format_version,
+            len(firmware),
+            len(device_type),
+        )
+        encoded += firmware + device_type
+    return bytes(encoded)
+
+
+def _decode_device_log(body: bytes, offset: int) -> tuple[list[DeviceMetadata], int]:
+    """Decode a device log written by _encode_device_log; return it and the new offset."""
+    (count,) = _ARCHIVE_TIER_HEADER.unpack_from(body, offset)
+    offset += _ARCHIVE_TIER_HEADER.size
+    entries = []
+    for _ in range(count):
+        timestamp, version, firmware_length, type_length = (
+            _ARCHIVE_DEVICE_ENTRY.unpack_from(body, offset)
+        )
+        offset += _ARCHIVE_DEVICE_ENTRY.size
+        firmware = body[offset:offset + firmware_length].decode("utf-8")
+        offset += firmware_length
+        device_type = body[offset:offset + type_length].decode("utf-8")
+        offset += type_length
+        entries.append(
+            DeviceMetadata(
+                timestamp=timestamp,
+                firmware_version=firmware or None,
+                device_type=device_type or None,
+                data_format_version=None if version == MISSING_INT else version,
+            )
         )
+    return entries, offset
+
+
+def _floats_to_json(column: array) -> list[float | None]:
+    """Convert a float column to a JSON-safe list (NaN becomes None)."""
+    return [None if value != value else value for value in column]
+
+
+def _floats_from_json(values: Iterable[float | None]) -> array:
+    """Convert a JSON list back into a float column."""
+    return array("d", (math.nan if value is None else value for value in values))
+
+
+@dataclass(frozen=True)
+class AggregateBucket:
+    """Represent the downsampled readings of one time bucket."""
+
+    start: float
+    count: int
+    gravity_min: float | None
+    gravity_mean: float | None
+    gravity_max: float | None
+    temperature_min: float | None
+    temperature_mean: float | None
+    temperature_max: float | None
+
+
+class _TierStats:
+    """Count, min, mean and max columns of one reading in an AggregateTier."""
+
+    __slots__ = ("count", "minimum", "mean", "maximum")
+
+    def __init__(self) -> None:
+        """Initialize empty columns."""
+        self.count = array("i")
+        self.minimum = array("d")
+        self.mean = array("d")
+        self.maximum = array("d")
+
+    def append_empty(self) -> None:
+        """Append a bucket without readings."""
+        self.count.append(0)
+        self.minimum.append(math.nan)
+        self.mean.append(math.nan)
+        self.maximum.append(math.nan)
+
+    def row(self, index: int) -> tuple[int, float, float, float]:
+        """Return (count, min, mean, max) of a bucket."""
+        return (
+            self.count[index], self.minimum[index],
+            self.mean[index], self.maximum[index],
+        )
+
+    def fold(
+        self, index: int, count: int, minimum: float, mean: float, maximum: float
+    ) -> None:
+        """Merge (count, min, mean, max) of some readings into a bucket."""
+        if not count:
+            return
+        total = self.count[index] + count
+        if self.count[index]:
+            self.minimum[index] = min(self.minimum[index], minimum)
+            self.maximum[index] = max(self.maximum[index], maximum)
+            self.mean[index] += (mean - self.mean[index]) * count / total
+        else:
+            self.minimum[index] = minimum
+            self.mean[index] = mean
+            self.maximum[index] = maximum
+        self.count[index] = total
+
+    def delete_front(self, count: int) -> None:
+        """Drop the oldest ``count`` buckets."""
+        for column in (self.count, self.minimum, self.mean, self.maximum):
+            del column[:count]
+
+    def to_dict(self) -> dict[str, list]:
+        """Convert to dictionary."""
+        return {
+            "count": list(self.count),
+            "min": _floats_to_json(self.minimum),
+            "mean": _floats_to_json(self.mean),
+            "max": _floats_to_json(self.maximum),
+        }
+
+    def load_dict(self, data: dict[str, list]) -> None:
+        """Load columns from a dictionary written by to_dict."""
+        self.count = array("i", data["count"])
+        self.minimum = _floats_from_json(data["min"])
+        self.mean = _floats_from_json(data["mean"])
+        self.maximum = _floats_from_json(data["max"])
+
+    def to_bytes(self, scale: int) -> bytes:
+        """Encode the columns for the binary archive."""
+        return (
+            _encode_column(self.count, 1)
+            + _encode_column(self.minimum, scale)
+            + _encode_column(self.mean, scale)
+            + _encode_column(self.maximum, scale)
+        )
+
+    def load_bytes(self, body: bytes, offset: int, count: int, scale: int) -> int:
+        """Decode columns written by to_bytes; return the new offset."""
+        offset = _decode_column(body, offset, count, self.count, 1, 0)
+        offset = _decode_column(body, offset, count, self.minimum, scale, math.nan)
+        offset = _decode_column(body, offset, count, self.mean, scale, math.nan)
+        return _decode_column(body, offset, count, self.maximum, scale, math.nan)
+
+
+def _single_reading(value: float) -> tuple[int, float, float, float]:
+    """Return the (count, min, mean, max) stats of a single, possibly missing, reading."""
+    if value != value:
+        return (0, math.nan, math.nan, math.nan)
+    return (1, value, value, value)
+
+
+class AggregateTier:
+    """Readings downsampled into fixed-width time buckets (min/mean/max)."""
+
+    __slots__ = ("bucket_seconds", "_starts", "gravity", "temperature")
+
+    def __init__(self, bucket_seconds: int) -> None:
+        """Initialize the tier."""
+        self.bucket_seconds = bucket_seconds
+        self._starts = array("d")
+        self.gravity = _TierStats()
+        self.temperature = _TierStats()
+
+    def fold(
+        self,
+        timestamp: float,
+        gravity: tuple[int, float, float, float],
+        temperature: tuple[int, float, float, float],
+    ) -> None:
+        """Merge readings at ``timestamp`` into their bucket."""
+        start = timestamp - timestamp % self.bucket_seconds
+        # Readings older than the newest bucket merge into it to keep the
+        # columns sorted; tiers are only ever fed in time order
+        if not self._starts or start > self._starts[-1]:
+            self._starts.append(start)
+            self.gravity.append_empty()
+            self.temperature.append_empty()
+        index = len(self._starts) - 1
+        self.gravity.fold(index, *gravity)
+        self.temperature.fold(index, *temperature)
+
+    def move_oldest_into(self, other: AggregateTier, cutoff: float) -> None:
+        """Fold all buckets starting before ``cutoff`` into a coarser tier."""
+        count = bisect_left(self._starts, cutoff)
+        for index in range(count):
+            other.fold(
+                self._starts[index], self.gravity.row(index), self.temperature.row(index)
+            )
+        del self._starts[:count]
+        self.gravity.delete_front(count)
+        self.temperature.delete_front(count)
+
+    @property
+    def oldest(self) -> float | None:
+        """Return the start of the oldest bucket."""
+        return self._starts[0] if self._starts else None
+
+    def __len__(self) -> int:
+        """Return the number of buckets."""
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[AggregateBucket]:
+        """Iterate over the buckets, oldest first."""
+        gravity = self.gravity
+        temperature = self.temperature
+        for index, start in enumerate(self._starts):
+            yield AggregateBucket(
+                start=start,
+                count=max(gravity.count[index], temperature.count[index]),
+                gravity_min=_nan_to_none(gravity.minimum[index]),
+                gravity_mean=_nan_to_none(gravity.mean[index]),
+                gravity_max=_nan_to_none(gravity.maximum[index]),
+                temperature_min=_nan_to_none(temperature.minimum[index]),
+                temperature_mean=_nan_to_none(temperature.mean[index]),
+                temperature_max=_nan_to_none(temperature.maximum[index]),
+            )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "start": list(self._starts),
+            "gravity": self.gravity.to_dict(),
+            "temperature": self.temperature.to_dict(),
+        }
+
+    def load_dict(self, data: dict[str, Any]) -> None:
+        """Load buckets from a dictionary written by to_dict."""
+        self._starts = array("d", data["start"])
+        self.gravity.load_dict(data["gravity"])
+        self.temperature.load_dict(data["temperature"])
+
+    def to_bytes(self) -> bytes:
+        """Encode the tier for the binary archive."""
+        return (
+            _ARCHIVE_TIER_HEADER.pack(len(self._starts))
+            + _encode_timestamps(self._starts)
+            + self.gravity.to_bytes(_GRAVITY_SCALE)
+            + self.temperature.to_bytes(_TEMPERATURE_SCALE)
+        )
+
+    def load_bytes(self, body: bytes, offset: int) -> int:
+        """Decode a tier written by to_bytes; return the new offset."""
+        (count,) = _ARCHIVE_TIER_HEADER.unpack_from(body, offset)
+        offset += _ARCHIVE_TIER_HEADER.size
+        offset = _decode_timestamps(body, offset, count, self._starts)
+        offset = self.gravity.load_bytes(body, offset, count, _GRAVITY_SCALE)
+        return self.temperature.load_bytes(body, offset, count, _TEMPERATURE_SCALE)
+
+
+def _nan_to_none(value: float) -> float | None:
+    """Return None for NaN."""
+    return None if value != value else value
+
+
+class SessionTimeSeries:
+    """Columnar storage for the data points of a brewing session.
+
+    Readings live in typed arrays (epoch seconds, gravity, temperature,
+    battery, signal strength, gravity velocity and acceleration) instead of
+    one object per point. Missing floats are stored as NaN and missing
+    integers as MISSING_INT. Indexing and iteration return read-only
+    DataPoint views built on demand.
+
+    Firmware version, device type and data format version are kept in a
+    device log with one entry per change rather than in a column; a point
+    view carries the entry in effect at its timestamp.
+
+    Only recent readings are kept at full resolution. Older ones are folded
+    into per-minute and then per-hour min/mean/max buckets (``minute`` and
+    ``hour``), so memory stays bounded while the whole fermentation curve,
+    including the OG window, survives at decreasing resolution.
+    """
+
+    __slots__ = (
+        "_timestamps", "_gravity", "_temperature", "_battery", "_signal",
+        "_velocity", "_accel_x", "_accel_y", "_accel_z",
+        "_device_times", "_device_log", "_gravity_count", "minute", "hour",
+    )
+
+    def __init__(
+        self,
+        points: Iterable[DataPoint] = (),
+        tiers: dict[str, Any] | None = None,
+        device_log: Iterable[dict[str, Any]] | None = None,
+    ) -> None:
+        """Initialize the series."""
+        self._timestamps = array("d")
+        self._gravity = array("d")
+        self._temperature = array("d")
+        self._battery = array("i")
+        self._signal = array("i")
+        self._velocity = array("d")
+        self._accel_x = array("d")
+        self._accel_y = array("d")
+        self._accel_z = array("d")
+        self._device_times = array("d")
+        self._device_log: list[DeviceMetadata] = []
+        # Rows with a gravity reading, kept up to date on append and eviction
+        self._gravity_count = 0
+        self.minute = AggregateTier(60)
+        self.hour = AggregateTier(3600)
+        if tiers:
+            self.minute.load_dict(tiers["minute"])
+            self.hour.load_dict(tiers["hour"])
+        for entry in device_log or ():
+            self._add_device_entry(DeviceMetadata.from_dict(entry))
+        for point in points:
+            self.append(point)
+
+    def append(self, point: DataPoint) -> None:
+        """Append a data point."""
+        self._timestamps.append(point.timestamp)
+        if point.gravity is None:
+            self._gravity.append(math.nan)
+        else:
+            self._gravity.append(point.gravity)
+            self._gravity_count += 1
+        self._temperature.append(
+            math.nan if point.temperature is None else point.temperature
+        )
+        self._battery.append(
+            MISSING_INT if point.battery_level is None else point.battery_level
+        )
+        self._signal.append(
+            MISSING_INT if point.signal_strength is None else point.signal_strength
+        )
+        for column, value in (
+            (self._velocity, point.gravity_velocity),
+            (self._accel_x, point.accelerometer_x),
+            (self._accel_y, point.accelerometer_y),
+            (self._accel_z, point.accelerometer_z),
+        ):
+            column.append(math.nan if value is None else value)
+        self._log_device_change(point)
+        self._apply_retention()
+
+    def _log_device_change(self, point: DataPoint) -> None:
+        """Add a device log entry if the point changes a known metadata field.
+
+        Unknown (None) fields of the point keep their previous value, so a
+        reading taken before the firmware packet arrived adds no entry.
+        """
+        current = self._device_log[-1] if self._device_log else DeviceMetadata(0)
+        firmware_version = point.firmware_version or current.firmware_version
+        device_type = point.device_type or current.device_type
+        data_format_version = (
+            current.data_format_version
+            if point.data_format_version is None
+            else point.data_format_version
+        )
+        if (firmware_version, device_type, data_format_version) != (
+            current.firmware_version, current.device_type, current.data_format_version
+        ):
+            self._add_device_entry(
+                DeviceMetadata(
+                    point.timestamp, firmware_version, device_type, data_format_version
+                )
+            )
+
+    def _add_device_entry(self, entry: DeviceMetadata) -> None:
+        """Append an entry to the device log."""
+        self._device_times.append(entry.timestamp)
+        self._device_log.append(entry)
+
+    @property
+    def device_log(self) -> list[DeviceMetadata]:
+        """Return the device metadata changes, oldest first."""
+        return list(self._device_log)
+
+    def device_log_to_dict(self) -> list[dict[str, Any]]:
+        """Convert the device log to a list of dictionaries."""
+        return [entry.to_dict() for entry in self._device_log]
+
+    def _apply_retention(self) -> None:
+        """Fold readings that left a tier's window into the next coarser tier.
+
+        Eviction happens in blocks (RETENTION_EVICT_POINTS points or
+        RETENTION_EVICT_SECONDS of data) so the cost of shifting the arrays
+        is amortized over many appends.
+        """
+        timestamps = self._timestamps
+        newest = timestamps[-1]
+        raw_cutoff = newest - RETENTION_RAW_SECONDS
+
+        evict = 0
+        if len(timestamps) > RETENTION_RAW_MAX_POINTS:
+            evict = len(timestamps) - RETENTION_RAW_MAX_POINTS + RETENTION_EVICT_POINTS
+        elif timestamps[0] < raw_cutoff - RETENTION_EVICT_SECONDS:
+            evict = bisect_left(timestamps, raw_cutoff)
+        if evict:
+            for index in range(evict):
+                gravity = _single_reading(self._gravity[index])
+                self._gravity_count -= gravity[0]
+                self.minute.fold(
+                    timestamps[index],
+                    gravity,
+                    _single_reading(self._temperature[index]),
+                )
+            for column in self._columns():
+                del column[:evict]
+
+        minute_cutoff = newest - RETENTION_MINUTE_SECONDS
+        oldest_minute = self.minute.oldest
+        if oldest_minute is not None and oldest_minute < minute_cutoff - RETENTION_EVICT_SECONDS:
+            self.minute.move_oldest_into(self.hour, minute_cutoff)
+
+    def _columns(self) -> tuple[array, ...]:
+        """Return the per-row columns."""
+        return (
+            self._timestamps, self._gravity, self._temperature,
+            self._battery, self._signal,
+            self._velocity, self._accel_x, self._accel_y, self._accel_z,
+        )
+
+    def copy(self) -> SessionTimeSeries:
+        """Return an independent copy, safe to read while this series grows."""
+        series = SessionTimeSeries(
+            tiers=self.tiers_to_dict(), device_log=self.device_log_to_dict()
+        )
+        for target, source in zip(series._columns(), self._columns()):
+            target.extend(source)
+        series._gravity_count = self._gravity_count
+        return series
+
+    def tiers_to_dict(self) -> dict[str, Any]:
+        """Convert the aggregate tiers to a dictionary."""
+        return {"minute": self.minute.to_dict(), "hour": self.hour.to_dict()}
+
+    def to_bytes(self) -> bytes:
+        """Encode the series in the binary archive format."""
+        body = (
+            _encode_timestamps(self._timestamps)
+            + _encode_column(self._gravity, _GRAVITY_SCALE)
+            + _encode_column(self._temperature, _TEMPERATURE_SCALE)
+            + _encode_column(self._battery, 1)
+            + _encode_column(self._signal, 1)
+            + _encode_column(self._velocity, _VELOCITY_SCALE)
+            + _encode_column(self._accel_x, _ACCELERATION_SCALE)
+            + _encode_column(self._accel_y, _ACCELERATION_SCALE)
+            + _encode_column(self._accel_z, _ACCELERATION_SCALE)
+            + self.minute.to_bytes()
+            + self.hour.to_bytes()
+            + _encode_device_log(self._device_log)
+        )
+        return _ARCHIVE_HEADER.pack(
+            ARCHIVE_MAGIC, ARCHIVE_VERSION, len(self._timestamps)
+        ) + zlib.compress(body, 9)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> SessionTimeSeries:
+        """Decode a series written by to_bytes."""
+        magic, version, count = _ARCHIVE_HEADER.unpack_from(data)
+        if magic != ARCHIVE_MAGIC or version != ARCHIVE_VERSION:
+            raise ValueError(f"Unsupported session archive (version {version})")
+        body = zlib.decompress(data[_ARCHIVE_HEADER.size:])
+
+        series = cls()
+        offset = _decode_timestamps(body, 0, count, series._timestamps)
+        offset = _decode_column(body, offset, count, series._gravity, _GRAVITY_SCALE, math.nan)
+        series._gravity_count = sum(1 for gravity in series._gravity if gravity == gravity)
+        offset = _decode_column(
+            body, offset, count, series._temperature, _TEMPERATURE_SCALE, math.nan
+        )
+        offset = _decode_column(body, offset, count, series._battery, 1, MISSING_INT)
+        offset = _decode_column(body, offset, count, series._signal, 1, MISSING_INT)
+        offset = _decode_column(
+            body, offset, count, series._velocity, _VELOCITY_SCALE, math.nan
+        )
+        for column in (series._accel_x, series._accel_y, series._accel_z):
+            offset = _decode_column(
+                body, offset, count, column, _ACCELERATION_SCALE, math.nan
+            )
+        offset = series.minute.load_bytes(body, offset)
+        offset = series.hour.load_bytes(body, offset)
+        entries, offset = _decode_device_log(body, offset)
+        for entry in entries:
+            series._add_device_entry(entry)
+        return series
+
+    def _point(self, index: int) -> DataPoint:
+        """Build the DataPoint view of one row."""
+        gravity = self._gravity[index]
+        temperature = self._temperature[index]
+        battery = self._battery[index]
+        signal = self._signal[index]
+        timestamp = self._timestamps[index]
+        device_index = bisect_right(self._device_times, timestamp) - 1
+        device = self._device_log[device_index] if device_index >= 0 else None
+        return DataPoint(
+            timestamp=timestamp,
+            gravity=None if math.isnan(gravity) else gravity,
+            temperature=None if math.isnan(temperature) else temperature,
+            battery_level=None if battery == MISSING_INT else battery,
+            signal_strength=None if signal == MISSING_INT else signal,
+            gravity_velocity=_nan_to_none(self._velocity[index]),
+            accelerometer_x=_nan_to_none(self._accel_x[index]),
+            accelerometer_y=_nan_to_none(self._accel_y[index]),
+            accelerometer_z=_nan_to_none(self._accel_z[index]),
+            firmware_version=device.firmware_version if device else None,
+            device_type=device.device_type if device else None,
+            data_format_version=device.data_format_version if device else None,
+        )
+
+    def __len__(self) -> int:
+        """Return the number of data points."""
+        return len(self._timestamps)
+
+    def count_gravity(self) -> int:
+        """Return the number of data points with a gravity reading."""
+        return self._gravity_count
+
+    def since(self, start: float) -> SeriesView:
+        """Return a view of the data points at or after ``start``."""
+        return SeriesView(self, bisect_left(self._timestamps, start), len(self))
+
+    @overload
+    def __getitem__(self, index: int) -> DataPoint: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> SeriesView: ...
+
+    def __getitem__(self, index: int | slice) -> DataPoint | SeriesView:
+        """Return the data point at an index, or a view of a contiguous slice."""
+        return SeriesView(self, 0, len(self))[index]
+
+    def __iter__(self) -> Iterator[DataPoint]:
+        """Iterate over the data points, oldest first."""
+        for index in range(len(self)):
+            yield self._point(index)
+
+    def __reversed__(self) -> Iterator[DataPoint]:
+        """Iterate over the data points, newest first."""
+        for index in range(len(self) - 1, -1, -1):
+            yield self._point(index)
+
+
+class SeriesView:
+    """Read-only view of a contiguous range of a SessionTimeSeries.
+
+    Only the series and the index range are kept; rows become DataPoint
+    views when accessed. A view is meant to be used right away: appending
+    to the series can fold old rows into the aggregate tiers and shift the
+    range.
+    """
+
+    __slots__ = ("_series", "_start", "_stop")
+
+    def __init__(self, series: SessionTimeSeries, start: int, stop: int) -> None:
+        """Initialize the view."""
+        self._series = series
+        self._start = start
+        self._stop = max(start, stop)
+
+    def __len__(self) -> int:
+        """Return the number of data points in the view."""
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> DataPoint: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> SeriesView: ...
+
+    def __getitem__(self, index: int | slice) -> DataPoint | SeriesView:
+        """Return the data point at an index, or a view of a contiguous slice."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("Only contiguous slices of data points are supported")
+            return SeriesView(self._series, self._start + start, self._start + stop)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("data point index out of range")
+        return self._series._point(self._start + index)
+
+    def __iter__(self) -> Iterator[DataPoint]:
+        """Iterate over the data points, oldest first."""
+        for index in range(self._start, self._stop):
+            yield self._series._point(index)
+
+    def __reversed__(self) -> Iterator[DataPoint]:
+        """Iterate over the data points, newest first."""
+        for index in range(self._stop - 1, self._start - 1, -1):
+            yield self._series._point(index)
 
 
 @dataclass
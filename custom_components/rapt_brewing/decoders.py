@@ -0,0 +1,192 @@
+"""Decoders for the advertisement formats of RAPT devices.
+
+A frame is the manufacturer data of an advertisement with its two company
+ID bytes in front ("RA" for RAPT, "KE" for KegLand), so every format is
+identified by the bytes a frame starts with plus the version byte after
+them. Decoders are looked up in ``DECODERS`` by that key; a new firmware
+format only needs a ``register_decoder`` call.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+import struct
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .ble_device import RAPTPillSensorData
+
+RAPT_PREFIX = b"RAPT"
+KEG_PREFIX = b"KEG"
+
+# Telemetry layouts, starting at the version byte after RAPT_PREFIX:
+# v1: version, MAC, temperature, gravity, accelerometer x/y/z, battery
+TELEMETRY_V1 = struct.Struct(">B6sHfhhhh")
+# v2: version, reserved, velocity valid, velocity, temperature, gravity,
+# accelerometer x/y/z, battery
+TELEMETRY_V2 = struct.Struct(">BxBfHfhhhh")
+TELEMETRY_OFFSET = len(RAPT_PREFIX)
+
+DEVICE_TYPE_VERSION = 0x64  # "d"
+
+
+# Conversions of raw telemetry fields (official RAPT formulas). They only use
+# arithmetic operators, so they apply to NumPy arrays as well as to scalars.
+def temperature_from_raw(raw: Any) -> Any:
+    """Convert 1/128 Kelvin to Celsius."""
+    return raw / 128.0 - 273.15
+
+
+def gravity_from_raw(raw: Any) -> Any:
+    """Convert gravity points (x1000) to specific gravity."""
+    return raw / 1000.0
+
+
+def acceleration_from_raw(raw: Any) -> Any:
+    """Convert 1/16 g to g."""
+    return raw / 16.0
+
+
+def battery_from_raw(raw: Any) -> Any:
+    """Convert 1/256 percent to whole percent."""
+    return raw // 256
+
+
+@dataclass(frozen=True)
+class PacketDecoder:
+    """Describe how to decode one packet format.
+
+    ``decode`` writes ``fields`` onto a sensor data object and may raise
+    ``struct.error`` or ``ValueError`` on a malformed frame.
+    """
+
+    name: str
+    min_length: int  # frame bytes, including the prefix
+    fields: tuple[str, ...]
+    decode: Callable[[bytes, RAPTPillSensorData], None]
+
+
+_TELEMETRY_FIELDS = (
+    "data_format_version",
+    "temperature",
+    "gravity",
+    "accelerometer_x",
+    "accelerometer_y",
+    "accelerometer_z",
+    "battery",
+)
+
+
+def _apply_telemetry(
+    data: RAPTPillSensorData,
+    version: int,
+    temperature: int,
+    gravity: float,
+    accel_x: int,
+    accel_y: int,
+    accel_z: int,
+    battery: int,
+) -> None:
+    """Store the telemetry fields shared by all formats."""
+    data.data_format_version = version
+    data.temperature = temperature_from_raw(temperature)
+    data.gravity = gravity_from_raw(gravity)
+    data.accelerometer_x = acceleration_from_raw(accel_x)
+    data.accelerometer_y = acceleration_from_raw(accel_y)
+    data.accelerometer_z = acceleration_from_raw(accel_z)
+    data.battery = battery_from_raw(battery)
+
+
+def _decode_telemetry_v1(frame: bytes, data: RAPTPillSensorData) -> None:
+    """Decode v1 telemetry: RAPT 01 mm*6 tt tt gg*4 xx xx yy yy zz zz bb bb."""
+    version, mac, temperature, gravity, accel_x, accel_y, accel_z, battery = (
+        TELEMETRY_V1.unpack_from(frame, TELEMETRY_OFFSET)
+    )
+    _apply_telemetry(data, version, temperature, gravity, accel_x, accel_y, accel_z, battery)
+    data.mac_address = mac.hex(":")
+
+
+def _decode_telemetry_v2(frame: bytes, data: RAPTPillSensorData) -> None:
+    """Decode v2 telemetry: RAPT 02 00 cc vv*4 tt tt gg*4 xx xx yy yy zz zz bb bb."""
+    (
+        version, velocity_valid, velocity, temperature, gravity,
+        accel_x, accel_y, accel_z, battery,
+    ) = TELEMETRY_V2.unpack_from(frame, TELEMETRY_OFFSET)
+    _apply_telemetry(data, version, temperature, gravity, accel_x, accel_y, accel_z, battery)
+    data.gravity_velocity_valid = velocity_valid == 1
+    data.gravity_velocity = velocity if velocity_valid == 1 else None
+
+
+def _decode_device_type(frame: bytes, data: RAPTPillSensorData) -> None:
+    """Decode the device type packet: RAPT 64 <device type string>."""
+    data.device_type = frame[TELEMETRY_OFFSET + 1:].decode("utf-8", errors="ignore").strip()
+
+
+def _decode_firmware_version(frame: bytes, data: RAPTPillSensorData) -> None:
+    """Decode the firmware version packet: KEG <firmware version string>."""
+    data.firmware_version = frame[len(KEG_PREFIX):].decode("utf-8", errors="ignore").strip()
+
+
+# Keyed by (prefix, version byte); a version of None matches any version
+# byte not registered explicitly
+DECODERS: dict[tuple[bytes, int | None], PacketDecoder] = {}
+_prefix_lengths: list[int] = []
+
+
+def register_decoder(prefix: bytes, version: int | None, decoder: PacketDecoder) -> None:
+    """Register the decoder of a packet format."""
+    DECODERS[(prefix, version)] = decoder
+    if len(prefix) not in _prefix_lengths:
+        _prefix_lengths.append(len(prefix))
+        _prefix_lengths.sort(reverse=True)
+
+
+def find_decoder(frame: bytes) -> PacketDecoder | None:
+    """Return the decoder for a frame, or None for an unknown format."""
+    for length in _prefix_lengths:
+        prefix = frame[:length]
+        if len(frame) > length and (decoder := DECODERS.get((prefix, frame[length]))):
+            return decoder
+        if decoder := DECODERS.get((prefix, None)):
+            return decoder
+    return None
+
+
+register_decoder(
+    RAPT_PREFIX, 1,
+    PacketDecoder(
+        "telemetry v1",
+        TELEMETRY_OFFSET + TELEMETRY_V1.size,
+        _TELEMETRY_FIELDS + ("mac_address",),
+        _decode_telemetry_v1,
+    ),
+)
+register_decoder(
+    RAPT_PREFIX, 2,
+    PacketDecoder(
+        "telemetry v2",
+        TELEMETRY_OFFSET + TELEMETRY_V2.size,
+        _TELEMETRY_FIELDS + ("gravity_velocity", "gravity_velocity_valid"),
+        _decode_telemetry_v2,
+    ),
+)
+register_decoder(
+    RAPT_PREFIX, DEVICE_TYPE_VERSION,
+    PacketDecoder("device type", TELEMETRY_OFFSET + 2, ("device_type",), _decode_device_type),
+)
+# Older firmware sent telemetry in the v1 layout whatever its version byte
+register_decoder(
+    RAPT_PREFIX, None,
+    PacketDecoder(
+        "legacy telemetry",
+        TELEMETRY_OFFSET + TELEMETRY_V1.size,
+        _TELEMETRY_FIELDS + ("mac_address",),
+        _decode_telemetry_v1,
+    ),
+)
+register_decoder(
+    KEG_PREFIX, None,
+    PacketDecoder(
+        "firmware version", len(KEG_PREFIX) + 1, ("firmware_version",), _decode_firmware_version
+    ),
+)
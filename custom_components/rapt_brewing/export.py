@@ -0,0 +1,115 @@
+"""Export of brewing session data to CSV and JSON files.
+
+Rows are generated lazily and formatted and written ``EXPORT_CHUNK_ROWS`` at
+a time, so the memory an export needs does not grow with the length of the
+session. Writing happens on the executor.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import csv
+from itertools import islice
+import os
+from typing import Any
+
+from homeassistant.helpers.json import json_dumps
+import homeassistant.util.dt as dt_util
+
+from .const import EXPORT_CHUNK_ROWS, EXPORT_FORMAT_CSV
+from .data import SessionTimeSeries
+
+EXPORT_COLUMNS = (
+    "timestamp",
+    "resolution",
+    "gravity",
+    "temperature",
+    "battery_level",
+    "signal_strength",
+    "gravity_velocity",
+    "accelerometer_x",
+    "accelerometer_y",
+    "accelerometer_z",
+    "firmware_version",
+    "device_type",
+    "data_format_version",
+)
+
+# Columns only recorded at full resolution
+_EMPTY_BUCKET_COLUMNS = (None,) * (len(EXPORT_COLUMNS) - 4)
+
+
+def iter_export_rows(series: SessionTimeSeries) -> Iterator[tuple]:
+    """Yield the rows of a session, oldest first.
+
+    Readings older than the full-resolution window only survive as hour
+    and minute buckets; these come first, with their mean gravity and
+    temperature and "hour" or "minute" as resolution. Stored readings
+    follow as they were recorded, with "raw" as resolution.
+    """
+    for resolution, tier in (("hour", series.hour), ("minute", series.minute)):
+        for bucket in tier:
+            yield (
+                dt_util.utc_from_timestamp(bucket.start).isoformat(),
+                resolution,
+                bucket.gravity_mean,
+                bucket.temperature_mean,
+                *_EMPTY_BUCKET_COLUMNS,
+            )
+    for point in series:
+        yield (
+            dt_util.utc_from_timestamp(point.timestamp).isoformat(),
+            "raw",
+            point.gravity,
+            point.temperature,
+            point.battery_level,
+            point.signal_strength,
+            point.gravity_velocity,
+            point.accelerometer_x,
+            point.accelerometer_y,
+            point.accelerometer_z,
+            point.firmware_version,
+            point.device_type,
+            point.data_format_version,
+        )
+
+
+def _chunks(rows: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    """Group rows into lists of at most ``size`` rows."""
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def write_session_export(
+    path: str,
+    export_format: str,
+    session: dict[str, Any],
+    series: SessionTimeSeries,
+) -> int:
+    """Write a session export file and return its row count (executor).
+
+    ``series`` must not change while it is written; pass a copy of the
+    series of a running session. The file is written next to its final
+    path and moved into place when complete.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.tmp"
+    rows = 0
+    with open(temp_path, "w", encoding="utf-8", newline="") as export_file:
+        if export_format == EXPORT_FORMAT_CSV:
+            writer = csv.writer(export_file)
+            writer.writerow(EXPORT_COLUMNS)
+            for chunk in _chunks(iter_export_rows(series), EXPORT_CHUNK_ROWS):
+                writer.writerows(chunk)
+                rows += len(chunk)
+        else:
+            export_file.write(f'{{"session": {json_dumps(session)}, "data_points": [')
+            for chunk in _chunks(iter_export_rows(series), EXPORT_CHUNK_ROWS):
+                export_file.write(
+                    ("," if rows else "")
+                    + ",".join(json_dumps(dict(zip(EXPORT_COLUMNS, row))) for row in chunk)
+                )
+                rows += len(chunk)
+            export_file.write("]}\n")
+    os.replace(temp_path, path)
+    return rows
@@ -0,0 +1,140 @@
+"""Ingest stage deciding which readings of a session are stored."""
+from __future__ import annotations
+
+from .data import DEVICE_METADATA_FIELDS, DataPoint
+
+
+class _Door:
+    """Swinging door of one reading channel.
+
+    Tracks the narrowest range of slopes from the anchor (last stored point)
+    that keeps every reading seen since within the deadband.
+    """
+
+    __slots__ = ("lower", "upper")
+
+    def __init__(self) -> None:
+        """Initialize a fully open door."""
+        self.lower = float("-inf")
+        self.upper = float("inf")
+
+    def narrow(self, anchor: float, value: float, elapsed: float, deadband: float) -> bool:
+        """Narrow the door for a new reading.
+
+        Return True if the line from the anchor to the reading lies inside the
+        door, i.e. within the deadband of every reading seen since the anchor.
+        """
+        self.lower = max(self.lower, (value - deadband - anchor) / elapsed)
+        self.upper = min(self.upper, (value + deadband - anchor) / elapsed)
+        return self.lower <= (value - anchor) / elapsed <= self.upper
+
+
+class ReadingCompressor:
+    """Swinging-door compression of session readings.
+
+    The newest reading is held back as long as the line from the last stored
+    point to it passes within the deadband of every gravity and temperature
+    reading in between. Once a new reading breaks that, the held reading is
+    stored and starts the next line. Readings are also stored when a value
+    appears or disappears, when the battery level or device metadata
+    changes, and when ``heartbeat`` seconds have passed since the last stored
+    point. Every skipped reading can therefore be reconstructed within its
+    deadband by linear interpolation between the stored points around it.
+
+    ``flush`` returns the held reading so nothing is lost when a session
+    stops or Home Assistant shuts down.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the compressor."""
+        self._anchor: DataPoint | None = None
+        self._held: DataPoint | None = None
+        self._gravity_door = _Door()
+        self._temperature_door = _Door()
+
+    def reset(self, anchor: DataPoint | None = None) -> None:
+        """Start over, optionally continuing from an already stored point."""
+        self._anchor = anchor
+        self._held = None
+        self._gravity_door = _Door()
+        self._temperature_door = _Door()
+
+    def add(
+        self,
+        point: DataPoint,
+        gravity_deadband: float,
+        temperature_deadband: float,
+        heartbeat: float,
+    ) -> list[DataPoint]:
+        """Feed a reading and return the points to store, oldest first."""
+        anchor = self._anchor
+        if anchor is None or self._changes_shape(anchor, point):
+            return self._store_step(point)
+
+        elapsed = point.timestamp - anchor.timestamp
+        if elapsed >= heartbeat:
+            return self._store_step(point)
+        if elapsed <= 0:
+            # Same timestamp as the anchor: a repeat is dropped, a different
+            # value cannot be interpolated and is stored
+            if (point.gravity, point.temperature) == (anchor.gravity, anchor.temperature):
+                return []
+            return self._store_step(point)
+
+        if self._doors_open(anchor, point, elapsed, gravity_deadband, temperature_deadband):
+            self._held = point
+            return []
+
+        # The line to the new reading leaves a door: the held reading becomes
+        # the new anchor and the doors are reopened between it and the new
+        # reading, whose own line always lies inside them
+        stored = self._held
+        self.reset(stored)
+        elapsed = point.timestamp - stored.timestamp
+        if elapsed > 0:
+            self._doors_open(stored, point, elapsed, gravity_deadband, temperature_deadband)
+        self._held = point
+        return [stored]
+
+    def flush(self) -> DataPoint | None:
+        """Return the held reading, which then counts as stored."""
+        held = self._held
+        if held is not None:
+            self.reset(held)
+        return held
+
+    def _store_step(self, point: DataPoint) -> list[DataPoint]:
+        """Store a reading that cannot be interpolated, after the held one."""
+        stored = [self._held] if self._held is not None else []
+        self.reset(point)
+        return [*stored, point]
+
+    def _doors_open(
+        self,
+        anchor: DataPoint,
+        point: DataPoint,
+        elapsed: float,
+        gravity_deadband: float,
+        temperature_deadband: float,
+    ) -> bool:
+        """Narrow both doors for a reading; return False if its line leaves either."""
+        gravity_open = point.gravity is None or self._gravity_door.narrow(
+            anchor.gravity, point.gravity, elapsed, gravity_deadband
+        )
+        temperature_open = point.temperature is None or self._temperature_door.narrow(
+            anchor.temperature, point.temperature, elapsed, temperature_deadband
+        )
+        return gravity_open and temperature_open
+
+    @staticmethod
+    def _changes_shape(anchor: DataPoint, point: DataPoint) -> bool:
+        """Return True if a reading differs in a way interpolation cannot bridge."""
+        return (
+            (anchor.gravity is None) != (point.gravity is None)
+            or (anchor.temperature is None) != (point.temperature is None)
+            or anchor.battery_level != point.battery_level
+            or any(
+                (value := getattr(point, key)) is not None and value != getattr(anchor, key)
+                for key in DEVICE_METADATA_FIELDS
+            )
+        )
@@ -112,7 +112,7 @@ class RAPTBrewingNumber(RAPTBrewingEntity, NumberEntity):
             session.target_temperature = value
             _LOGGER.warning("RAPT NUMBER: Set target temperature to %.1f°C for session: %s", value, session.name)
         
-        await self.coordinator._save_data()
+        self.coordinator.async_schedule_save(session)
         await self.coordinator.async_request_refresh()
 
     @property
@@ -94,8 +94,8 @@ class RAPTBrewingSelect(RAPTBrewingEntity, SelectEntity):
         """Select active session."""
         for session in self.coordinator.data.sessions.values():
             if session.name == session_name and session.state == "active":
-                self.coordinator.data.set_current_session(session.id)
-                await self.coordinator._save_data()
+                await self.coordinator.async_set_current_session(session.id)
+                self.coordinator.async_schedule_save(session)
                 await self.coordinator.async_request_refresh()
                 break
 
@@ -0,0 +1,124 @@
+"""Services of the RAPT Brewing integration."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import slugify
+
+from .const import (
+    DOMAIN,
+    EXPORT_DIR,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_JSON,
+    SERVICE_EXPORT_SESSION_DATA,
+)
+from .export import write_session_export
+
+if TYPE_CHECKING:
+    from .coordinator import RAPTBrewingCoordinator
+    from .data import BrewingSession
+
+ATTR_SESSION_ID = "session_id"
+ATTR_FORMAT = "format"
+
+EXPORT_SESSION_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_SESSION_ID): cv.string,
+        vol.Optional(ATTR_FORMAT, default=EXPORT_FORMAT_CSV): vol.In(
+            [EXPORT_FORMAT_CSV, EXPORT_FORMAT_JSON]
+        ),
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def _async_export_session_data(call: ServiceCall) -> ServiceResponse:
+        """Export a session to a file under the config directory."""
+        coordinator, session = _find_session(hass, call.data.get(ATTR_SESSION_ID))
+        export_format = call.data[ATTR_FORMAT]
+
+        series = await coordinator.async_get_session_data_points(session.id)
+        if not session.archived:
+            # The running session grows while the file is written
+            series = series.copy()
+        path = hass.config.path(
+            EXPORT_DIR, f"{session.id}_{slugify(session.name)}.{export_format}"
+        )
+        rows = await hass.async_add_executor_job(
+            write_session_export, path, export_format, _session_summary(session), series
+        )
+        return {"path": path, "rows": rows, "session_id": session.id}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT_SESSION_DATA,
+        _async_export_session_data,
+        schema=EXPORT_SESSION_DATA_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _find_session(
+    hass: HomeAssistant, session_id: str | None
+) -> tuple[RAPTBrewingCoordinator, BrewingSession]:
+    """Return the coordinator and session to export.
+
+    Without a session ID the current session is exported, which requires
+    exactly one fermenter with a running session.
+    """
+    coordinators: list[RAPTBrewingCoordinator] = [
+        entry.runtime_data
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+    if session_id is not None:
+        for coordinator in coordinators:
+            if (session := coordinator.data.get_session(session_id)) is not None:
+                return coordinator, session
+        raise ServiceValidationError(f"Unknown brewing session: {session_id}")
+
+    current = [
+        (coordinator, coordinator.data.current_session)
+        for coordinator in coordinators
+        if coordinator.data.current_session is not None
+    ]
+    if len(current) != 1:
+        raise ServiceValidationError(
+            "Specify the session_id of the session to export"
+            if current
+            else "There is no current brewing session to export"
+        )
+    return current[0]
+
+
+def _session_summary(session: BrewingSession) -> dict[str, Any]:
+    """Return the session fields written at the top of a JSON export."""
+    return {
+        "id": session.id,
+        "name": session.name,
+        "recipe": session.recipe,
+        "state": session.state,
+        "stage": session.stage,
+        "original_gravity": session.original_gravity,
+        "target_gravity": session.target_gravity,
+        "current_gravity": session.current_gravity,
+        "alcohol_percentage": session.alcohol_percentage,
+        "attenuation": session.attenuation,
+        "started_at": session.started_at.isoformat() if session.started_at else None,
+        "completed_at": session.completed_at.isoformat() if session.completed_at else None,
+    }
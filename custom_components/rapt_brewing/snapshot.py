@@ -0,0 +1,268 @@
+"""Derived values of the current brewing session, computed once per update."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from itertools import islice
+import statistics
+import time
+from types import MappingProxyType
+from typing import Any
+
+import homeassistant.util.dt as dt_util
+
+from .analysis import RegressionFit
+from .const import (
+    FERMENTATION_RATE_ACTIVE,
+    FERMENTATION_RATE_MODERATE,
+    FERMENTATION_RATE_SLOW,
+    FERMENTATION_RATE_VIGOROUS,
+    RECENT_READINGS_WINDOW,
+)
+from .data import BrewingSession, DataPoint
+
+# Readings reported by the Pill that are shown as they are
+_DEVICE_READING_KEYS = (
+    "gravity_velocity",
+    "accelerometer_x",
+    "accelerometer_y",
+    "accelerometer_z",
+    "firmware_version",
+    "device_type",
+    "data_format_version",
+)
+
+
+@dataclass(frozen=True)
+class SessionSnapshot:
+    """Represent the sensor values of the current session after one update.
+
+    The coordinator builds a new snapshot after every update, so sensors only
+    look up their value by key instead of each deriving it again. ``version``
+    increases with every snapshot.
+    """
+
+    version: int = 0
+    values: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    attributes: Mapping[str, Mapping[str, Any]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+    @classmethod
+    def build(
+        cls,
+        version: int,
+        session: BrewingSession | None,
+        latest_point: DataPoint | None,
+        corrected_gravity: float | None,
+        rate_fit: RegressionFit | None,
+        recent_points: Sequence[DataPoint] = (),
+    ) -> SessionSnapshot:
+        """Derive all sensor values and attributes of a session.
+
+        ``recent_points`` are the latest readings as received, oldest first;
+        the stored points of a session skip readings that can be
+        interpolated, which leaves too few for the device stability and
+        fermentation activity.
+        """
+        if session is None:
+            return cls(version=version, values=MappingProxyType({"active_alerts": 0}))
+
+        unacknowledged = [alert for alert in session.alerts if not alert.acknowledged]
+        values: dict[str, Any] = {
+            "session_name": session.name,
+            "original_gravity": session.original_gravity,
+            "current_gravity": session.current_gravity,
+            "current_gravity_temp_corrected": (
+                round(corrected_gravity, 4) if corrected_gravity is not None else None
+            ),
+            "target_gravity": session.target_gravity,
+            "alcohol_percentage": (
+                round(session.alcohol_percentage, 2) if session.alcohol_percentage else None
+            ),
+            "attenuation": round(session.attenuation, 1) if session.attenuation else None,
+            "fermentation_rate": (
+                round(session.fermentation_rate, 6) if session.fermentation_rate else None
+            ),
+            "current_temperature": session.current_temperature,
+            "target_temperature": session.target_temperature,
+            "battery_level": latest_point.battery_level if latest_point else None,
+            "signal_strength": latest_point.signal_strength if latest_point else None,
+            "session_duration": _session_duration(session),
+            "active_alerts": len(unacknowledged),
+            "last_reading_time": (
+                dt_util.utc_from_timestamp(latest_point.timestamp) if latest_point else None
+            ),
+            "device_stability": _device_stability(recent_points),
+            "fermentation_activity": _fermentation_activity(recent_points),
+        }
+        for key in _DEVICE_READING_KEYS:
+            values[key] = getattr(latest_point, key) if latest_point else None
+
+        attributes: dict[str, Mapping[str, Any]] = {
+            "session_name": {
+                "recipe": session.recipe,
+                "started_at": session.started_at.isoformat() if session.started_at else None,
+                "completed_at": session.completed_at.isoformat() if session.completed_at else None,
+                "notes": session.notes,
+            },
+            "current_gravity": {
+                "gravity_points": session.data_points.count_gravity(),
+                "last_24h_points": sum(
+                    1 for dp in session.data_points[-24:] if dp.gravity is not None
+                ),
+            },
+            "fermentation_rate": _fermentation_rate_attributes(session, rate_fit),
+            "active_alerts": {
+                "alerts": [
+                    {
+                        "type": alert.type,
+                        "message": alert.message,
+                        "timestamp": alert.timestamp.isoformat(),
+                        "acknowledged": alert.acknowledged,
+                    }
+                    for alert in unacknowledged
+                ]
+            },
+        }
+
+        return cls(
+            version=version,
+            values=MappingProxyType(values),
+            attributes=MappingProxyType(
+                {key: MappingProxyType(attrs) for key, attrs in attributes.items()}
+            ),
+        )
+
+
+def _session_duration(session: BrewingSession) -> float | None:
+    """Return the session duration in hours."""
+    if not session.started_at:
+        return None
+    end = session.completed_at or dt_util.now()
+    return round((end - session.started_at).total_seconds() / 3600, 1)
+
+
+def _fermentation_rate_attributes(
+    session: BrewingSession, rate_fit: RegressionFit | None
+) -> dict[str, Any]:
+    """Return the attributes of the fermentation rate sensor."""
+    attrs: dict[str, Any] = {}
+    if session.fermentation_rate is not None:
+        attrs.update({
+            "trend": "decreasing" if session.fermentation_rate < -0.001 else "stable" if abs(session.fermentation_rate) <= 0.001 else "increasing",
+            "rate_per_day": round(session.fermentation_rate * 24, 4) if session.fermentation_rate else None,
+        })
+    if rate_fit is not None:
+        attrs.update({
+            "rate_stderr": round(rate_fit.rate_stderr, 6) if rate_fit.rate_stderr is not None else None,
+            "r_squared": round(rate_fit.r_squared, 3) if rate_fit.r_squared is not None else None,
+            "window_readings": rate_fit.count,
+            "window_hours": round(rate_fit.span_hours, 1),
+        })
+    return attrs
+
+
+def _accelerometer_points(points: Iterable[DataPoint]) -> list[DataPoint]:
+    """Return the points that carry a full accelerometer reading."""
+    return [
+        point for point in points
+        if point.accelerometer_x is not None
+        and point.accelerometer_y is not None
+        and point.accelerometer_z is not None
+    ]
+
+
+def _device_stability(data_points: Sequence[DataPoint]) -> str | None:
+    """Calculate device stability based on accelerometer data."""
+    if not data_points:
+        return None
+
+    # Last 5 readings
+    accel_points = _accelerometer_points(islice(reversed(data_points), 5))
+    if len(accel_points) < 2:
+        return "Unknown"
+
+    try:
+        x_std = statistics.stdev(point.accelerometer_x for point in accel_points)
+        y_std = statistics.stdev(point.accelerometer_y for point in accel_points)
+        z_std = statistics.stdev(point.accelerometer_z for point in accel_points)
+    except statistics.StatisticsError:
+        return "Unknown"
+
+    # Classify the overall stability metric
+    stability_metric = (x_std + y_std + z_std) / 3
+    if stability_metric < 0.05:
+        return "Very Stable"
+    if stability_metric < 0.15:
+        return "Stable"
+    if stability_metric < 0.35:
+        return "Slightly Unstable"
+    return "Unstable"
+
+
+def _accelerometer_variation(points: Iterable[DataPoint]) -> float | None:
+    """Calculate accelerometer variation as an indicator of CO2 activity."""
+    accel_points = _accelerometer_points(points)
+    if len(accel_points) < 3:
+        return None
+
+    # Standard deviation of the magnitude of each reading
+    return statistics.stdev(
+        (point.accelerometer_x**2 + point.accelerometer_y**2 + point.accelerometer_z**2)**0.5
+        for point in accel_points
+    )
+
+
+def _fermentation_activity(data_points: Sequence[DataPoint]) -> str | None:
+    """Calculate fermentation activity from gravity velocity and accelerometer data over the last hour."""
+    if not data_points:
+        return None
+
+    since = time.time() - RECENT_READINGS_WINDOW
+    recent_points = [point for point in data_points if point.timestamp >= since]
+    if len(recent_points) < 2:
+        return "Unknown"
+
+    # Average gravity velocity from RAPT over the last hour
+    gravity_velocities = [
+        abs(point.gravity_velocity) for point in recent_points
+        if point.gravity_velocity is not None
+    ]
+
+    # Average fermentation rate over the last hour as backup
+    avg_fermentation_rate = None
+    time_span = (recent_points[-1].timestamp - recent_points[0].timestamp) / 3600  # hours
+    if time_span > 0:
+        gravities = [point.gravity for point in recent_points if point.gravity is not None]
+        if len(gravities) >= 2:
+            avg_fermentation_rate = abs(gravities[-1] - gravities[0]) / time_span  # SG/hour
+
+    # Accelerometer variation (CO2 bubbles cause vibration)
+    accel_variation = _accelerometer_variation(recent_points)
+
+    if gravity_velocities:
+        # Official gravity velocity from RAPT (points per day)
+        avg_velocity = sum(gravity_velocities) / len(gravity_velocities)
+        if avg_velocity > 19.0:  # peak fermentation
+            return "Vigorous" if accel_variation and accel_variation > 0.2 else "Active"
+        if avg_velocity > 10.0:  # good fermentation
+            return "Active"
+        if avg_velocity > 2.0:  # steady progress
+            return "Moderate"
+        if avg_velocity > 1.0:  # slow but progressing
+            return "Slow"
+        return "Inactive"
+
+    if avg_fermentation_rate is not None:
+        if avg_fermentation_rate > FERMENTATION_RATE_VIGOROUS:  # >19 points/day
+            return "Vigorous" if accel_variation and accel_variation > 0.2 else "Active"
+        if avg_fermentation_rate > FERMENTATION_RATE_ACTIVE:  # >10 points/day
+            return "Active"
+        if avg_fermentation_rate > FERMENTATION_RATE_MODERATE:  # >2 points/day
+            return "Moderate"
+        if avg_fermentation_rate > FERMENTATION_RATE_SLOW:  # >1 point/day
+            return "Slow"
+        return "Inactive"
+
+    return "Unknown"
@@ -0,0 +1,613 @@
+"""SQLite storage backend for RAPT Brewing sessions."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable
+import logging
+import os
+import sqlite3
+from typing import Any, Final
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import json_dumps
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.util.json import json_loads
+
+from .data import DataPoint, DeviceMetadata, SessionTimeSeries
+from .storage import RAPTBrewingStorage
+
+_LOGGER = logging.getLogger(__name__)
+
+SQLITE_SCHEMA_VERSION: Final = 1
+
+_SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    started_at TEXT,
+    archived INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL,
+    tiers TEXT,
+    raw_since REAL
+);
+CREATE INDEX IF NOT EXISTS sessions_started_at ON sessions (started_at);
+CREATE TABLE IF NOT EXISTS points (
+    session_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    gravity REAL,
+    temperature REAL,
+    battery_level INTEGER,
+    signal_strength INTEGER,
+    gravity_velocity REAL,
+    accelerometer_x REAL,
+    accelerometer_y REAL,
+    accelerometer_z REAL
+);
+CREATE INDEX IF NOT EXISTS points_session_ts ON points (session_id, ts);
+CREATE INDEX IF NOT EXISTS points_ts ON points (ts);
+CREATE TABLE IF NOT EXISTS device_log (
+    session_id TEXT NOT NULL,
+    ts REAL NOT NULL,
+    firmware_version TEXT,
+    device_type TEXT,
+    data_format_version INTEGER
+);
+CREATE INDEX IF NOT EXISTS device_log_session_ts ON device_log (session_id, ts);
+CREATE TABLE IF NOT EXISTS alerts (
+    session_id TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    type TEXT NOT NULL,
+    message TEXT NOT NULL,
+    acknowledged INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS alerts_session_timestamp ON alerts (session_id, timestamp);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Columns of a points row after the session ID, in DataPoint field order
+_POINT_COLUMNS: Final = (
+    "ts, gravity, temperature, battery_level, signal_strength,"
+    " gravity_velocity, accelerometer_x, accelerometer_y, accelerometer_z"
+)
+
+_INSERT_POINT: Final = (
+    f"INSERT INTO points (session_id, {_POINT_COLUMNS})"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+# Session keys kept in their own tables rather than in the session document
+_SESSION_TABLE_KEYS: Final = ("data_points", "data_tiers", "device_log", "alerts")
+
+
+def _point_row(session_id: str, point: dict[str, Any]) -> tuple:
+    """Return the points table row of a stored data point."""
+    return (
+        session_id,
+        point["ts"],
+        point.get("gravity"),
+        point.get("temperature"),
+        point.get("battery_level"),
+        point.get("signal_strength"),
+        point.get("gravity_velocity"),
+        point.get("accelerometer_x"),
+        point.get("accelerometer_y"),
+        point.get("accelerometer_z"),
+    )
+
+
+def _write_tiers(
+    connection: sqlite3.Connection,
+    session_id: str,
+    tiers: dict[str, Any],
+    raw_since: float | None,
+) -> None:
+    """Store the aggregate tiers of a session (executor).
+
+    ``raw_since`` is the timestamp of the oldest reading kept at full
+    resolution next to the tiers; older rows of the points table are
+    already folded into them.
+    """
+    connection.execute(
+        "UPDATE sessions SET tiers = ?, raw_since = ? WHERE id = ?",
+        (json_dumps(tiers), raw_since, session_id),
+    )
+
+
+def _write_series_tiers(
+    connection: sqlite3.Connection, session_id: str, series: SessionTimeSeries
+) -> None:
+    """Store the aggregate tiers of a time series (executor)."""
+    _write_tiers(
+        connection,
+        session_id,
+        series.tiers_to_dict(),
+        series[0].timestamp if len(series) else None,
+    )
+
+
+def _write_device_log(
+    connection: sqlite3.Connection, session_id: str, entries: Iterable[dict[str, Any]]
+) -> None:
+    """Replace the device log of a session (executor)."""
+    connection.execute("DELETE FROM device_log WHERE session_id = ?", (session_id,))
+    connection.executemany(
+        "INSERT INTO device_log (session_id, ts, firmware_version, device_type,"
+        " data_format_version) VALUES (?, ?, ?, ?, ?)",
+        (
+            (
+                session_id,
+                entry["ts"],
+                entry.get("firmware_version"),
+                entry.get("device_type"),
+                entry.get("data_format_version"),
+            )
+            for entry in entries
+        ),
+    )
+
+
+class RAPTBrewingSQLiteStorage:
+    """Session storage in a local SQLite database.
+
+    Drop-in alternative to ``RAPTBrewingStorage`` for installations with many
+    Pills or years of batches. Sessions, readings, device logs and alerts
+    live in their own tables; readings are indexed by session and time so
+    ranges can be read without loading whole sessions, and every reading is
+    kept at full resolution, also for archived sessions. A session is read
+    back with its minute and hour tiers and only the readings they do not
+    cover yet.
+
+    Readings and snapshots are queued and written at most once per save
+    window, together, in a single transaction on the executor. All database
+    work is serialized by one lock, so the connection is only ever used by
+    one thread at a time.
+
+    On first use the database is filled from the ``Store`` JSON document and
+    archives of the same key, which are left in place untouched. When
+    switching back, ``async_export_store`` copies the database into them.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the storage."""
+        self.hass = hass
+        self._key = key
+        self._path = hass.config.path(STORAGE_DIR, f"{key}.db")
+        self._connection: sqlite3.Connection | None = None
+        self._lock = asyncio.Lock()
+        self._pending_points: list[tuple] = []
+        self._pending_fields: dict[str, dict[str, Any]] = {}
+        self._snapshot_func: Callable[[], dict[str, Any]] = dict
+        self._snapshot_pending = False
+        self._unsub_write: CALLBACK_TYPE | None = None
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Return False; readings are written straight to their table."""
+        return False
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Open the database, importing the JSON store on first use, and read it."""
+        async with self._lock:
+            is_empty = await self.hass.async_add_executor_job(self._open)
+            if is_empty:
+                await self._async_import_store()
+            return await self.hass.async_add_executor_job(self._read_all)
+
+    async def _async_import_store(self) -> None:
+        """Copy the sessions of the JSON store into a new database."""
+        store = RAPTBrewingStorage(self.hass, self._key)
+        data = await store.async_load()
+        if not data:
+            return
+        archives: dict[str, SessionTimeSeries] = {}
+        for session_id, session_data in data.get("sessions", {}).items():
+            if session_data.get("archived"):
+                series = await store.async_load_archive(session_id)
+                if series is not None:
+                    archives[session_id] = series
+        await self.hass.async_add_executor_job(self._import, data, archives)
+        _LOGGER.info(
+            "RAPT STORAGE: Imported %d session(s) from the JSON store into %s",
+            len(data.get("sessions", {})), self._path,
+        )
+
+    async def async_export_store(self) -> None:
+        """Copy the database into the JSON store of the same key and remove it.
+
+        The JSON store is not written while the database is in use. Removing
+        the database afterwards makes a later switch to SQLite import the
+        JSON store again instead of reopening outdated data.
+        """
+        async with self._lock:
+            is_empty = await self.hass.async_add_executor_job(self._open)
+            data = None if is_empty else await self.hass.async_add_executor_job(self._read_all)
+            archives: dict[str, SessionTimeSeries] = {}
+            for session_id, session_data in (data or {}).get("sessions", {}).items():
+                if session_data.get("archived"):
+                    series = await self.hass.async_add_executor_job(
+                        self._read_series, session_id
+                    )
+                    if series is not None:
+                        archives[session_id] = series
+            await self.hass.async_add_executor_job(self._connection.close)
+            self._connection = None
+
+        if data is not None:
+            store = RAPTBrewingStorage(self.hass, self._key)
+            # Archives first, so the snapshot never refers to a missing one
+            for session_id, series in archives.items():
+                await store.async_save_archive(session_id, series)
+            await store.async_save(lambda: data)
+            _LOGGER.info(
+                "RAPT STORAGE: Exported %d session(s) from %s into the JSON store",
+                len(data["sessions"]), self._path,
+            )
+        await self.hass.async_add_executor_job(self._remove_database)
+
+    @callback
+    def async_append(
+        self,
+        session_id: str,
+        point: dict[str, Any],
+        fields: dict[str, Any],
+        delay: float,
+    ) -> None:
+        """Queue a reading, written within ``delay`` seconds."""
+        self._pending_points.append(_point_row(session_id, point))
+        self._pending_fields.setdefault(session_id, {}).update(fields)
+        self._schedule_write(delay)
+
+    @callback
+    def async_delay_save(
+        self, data_func: Callable[[], dict[str, Any]], delay: float
+    ) -> None:
+        """Write a snapshot within ``delay`` seconds.
+
+        ``data_func`` is evaluated when the write happens.
+        """
+        self._snapshot_func = data_func
+        self._snapshot_pending = True
+        self._schedule_write(delay)
+
+    async def async_save(self, data_func: Callable[[], dict[str, Any]]) -> None:
+        """Write a snapshot and all queued readings now."""
+        self._snapshot_func = data_func
+        self._snapshot_pending = True
+        await self._async_write()
+
+    async def async_flush(self) -> None:
+        """Write anything queued immediately."""
+        if self._unsub_write is not None:
+            self._unsub_write()
+            self._unsub_write = None
+        await self._async_write()
+
+    async def async_close(self) -> None:
+        """Write anything queued and close the database."""
+        await self.async_flush()
+        async with self._lock:
+            if self._connection is not None:
+                await self.hass.async_add_executor_job(self._connection.close)
+                self._connection = None
+
+    @callback
+    def _schedule_write(self, delay: float) -> None:
+        """Start the save window unless one is already open."""
+        if self._unsub_write is None:
+            self._unsub_write = async_call_later(
+                self.hass, delay, self._async_handle_write_timer
+            )
+
+    async def _async_handle_write_timer(self, _now: Any) -> None:
+        """Write queued data when the save window closes."""
+        self._unsub_write = None
+        await self._async_write()
+
+    async def _async_write(self) -> None:
+        """Write queued readings and any pending snapshot in one transaction."""
+        async with self._lock:
+            if self._connection is None:
+                return
+            points, self._pending_points = self._pending_points, []
+            fields, self._pending_fields = self._pending_fields, {}
+            snapshot = None
+            if self._snapshot_pending:
+                self._snapshot_pending = False
+                snapshot = self._snapshot_func()
+            if points or fields or snapshot is not None:
+                await self.hass.async_add_executor_job(
+                    self._write, points, fields, snapshot
+                )
+
+    async def async_save_archive(self, session_id: str, series: SessionTimeSeries) -> None:
+        """Make sure every reading of a finished session is in the database.
+
+        Readings already reach the database as they are recorded, so only
+        those newer than the latest stored one are added.
+        """
+        await self._async_write()
+        async with self._lock:
+            await self.hass.async_add_executor_job(
+                self._insert_newer_points, session_id, series
+            )
+
+    async def async_load_archive(self, session_id: str) -> SessionTimeSeries | None:
+        """Read the readings of a session."""
+        async with self._lock:
+            return await self.hass.async_add_executor_job(
+                self._read_series, session_id
+            )
+
+    async def async_remove_archive(self, session_id: str) -> None:
+        """Delete the readings and alerts of a session."""
+        async with self._lock:
+            await self.hass.async_add_executor_job(self._delete_session, session_id)
+
+    def _open(self) -> bool:
+        """Open the database, creating the schema; return True if it is empty (executor)."""
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        connection = sqlite3.connect(self._path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with connection:
+            connection.executescript(_SCHEMA)
+            connection.execute(f"PRAGMA user_version={SQLITE_SCHEMA_VERSION}")
+        self._connection = connection
+        # Settings are written with every snapshot, so an empty meta table
+        # means nothing was ever stored (or the import did not complete)
+        (meta_rows,) = connection.execute("SELECT COUNT(*) FROM meta").fetchone()
+        return meta_rows == 0
+
+    def _remove_database(self) -> None:
+        """Remove the database file and its write-ahead log (executor)."""
+        for suffix in ("", "-wal", "-shm"):
+            try:
+                os.remove(f"{self._path}{suffix}")
+            except FileNotFoundError:
+                pass
+
+    def _read_all(self) -> dict[str, Any] | None:
+        """Read all sessions in the format of the JSON store (executor)."""
+        connection = self._connection
+        meta = {
+            key: json_loads(value)
+            for key, value in connection.execute("SELECT key, value FROM meta")
+        }
+
+        alerts: dict[str, list[dict[str, Any]]] = {}
+        for session_id, timestamp, alert_type, message, acknowledged in connection.execute(
+            "SELECT session_id, timestamp, type, message, acknowledged"
+            " FROM alerts ORDER BY session_id, timestamp"
+        ):
+            alerts.setdefault(session_id, []).append(
+                {
+                    "type": alert_type,
+                    "message": message,
+                    "timestamp": timestamp,
+                    "acknowledged": bool(acknowledged),
+                }
+            )
+
+        sessions: dict[str, dict[str, Any]] = {}
+        for session_id, archived, data, tiers, raw_since in connection.execute(
+            "SELECT id, archived, data, tiers, raw_since FROM sessions"
+        ).fetchall():
+            session_data = json_loads(data)
+            session_data["alerts"] = alerts.get(session_id, [])
+            if not archived:
+                session_data["data_points"] = [
+                    DataPoint(*row).to_dict()
+                    for row in self._select_points(session_id, raw_since if tiers else None)
+                ]
+                session_data["device_log"] = [
+                    entry.to_dict() for entry in self._select_device_log(session_id)
+                ]
+                if tiers:
+                    session_data["data_tiers"] = json_loads(tiers)
+            sessions[session_id] = session_data
+
+        if not sessions and not meta:
+            return None
+        return {
+            "sessions": sessions,
+            "current_session_id": meta.get("current_session_id"),
+            "settings": meta.get("settings", {}),
+        }
+
+    def _select_points(
+        self, session_id: str, since: float | None = None
+    ) -> Iterable[tuple]:
+        """Return the stored readings of a session, oldest first (executor).
+
+        With ``since``, only the readings at or after it are returned.
+        """
+        if since is None:
+            return self._connection.execute(
+                f"SELECT {_POINT_COLUMNS} FROM points WHERE session_id = ? ORDER BY ts",
+                (session_id,),
+            )
+        return self._connection.execute(
+            f"SELECT {_POINT_COLUMNS} FROM points WHERE session_id = ? AND ts >= ?"
+            " ORDER BY ts",
+            (session_id, since),
+        )
+
+    def _select_device_log(self, session_id: str) -> list[DeviceMetadata]:
+        """Return the device log of a session, oldest first (executor)."""
+        return [
+            DeviceMetadata(*row)
+            for row in self._connection.execute(
+                "SELECT ts, firmware_version, device_type, data_format_version"
+                " FROM device_log WHERE session_id = ? ORDER BY ts",
+                (session_id,),
+            )
+        ]
+
+    def _read_series(self, session_id: str) -> SessionTimeSeries | None:
+        """Read the readings of a session into a time series (executor)."""
+        row = self._connection.execute(
+            "SELECT tiers, raw_since FROM sessions WHERE id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        tiers, raw_since = row
+        return SessionTimeSeries(
+            (
+                DataPoint(*point)
+                for point in self._select_points(session_id, raw_since if tiers else None)
+            ),
+            tiers=json_loads(tiers) if tiers else None,
+            device_log=(entry.to_dict() for entry in self._select_device_log(session_id)),
+        )
+
+    def _write(
+        self,
+        points: list[tuple],
+        fields: dict[str, dict[str, Any]],
+        snapshot: dict[str, Any] | None,
+    ) -> None:
+        """Write readings, journaled session fields and a snapshot (executor)."""
+        with self._connection as connection:
+            connection.executemany(_INSERT_POINT, points)
+            if snapshot is not None:
+                self._write_snapshot(connection, snapshot)
+                return
+            for session_id, session_fields in fields.items():
+                if "device_log" in session_fields:
+                    session_fields = dict(session_fields)
+                    _write_device_log(
+                        connection, session_id, session_fields.pop("device_log")
+                    )
+                row = connection.execute(
+                    "SELECT data FROM sessions WHERE id = ?", (session_id,)
+                ).fetchone()
+                if row is None:
+                    # Not in a snapshot yet; the next one includes the fields
+                    continue
+                connection.execute(
+                    "UPDATE sessions SET data = ? WHERE id = ?",
+                    (json_dumps({**json_loads(row[0]), **session_fields}), session_id),
+                )
+
+    def _write_snapshot(self, connection: sqlite3.Connection, data: dict[str, Any]) -> None:
+        """Write sessions, alerts and settings, deleting removed sessions (executor)."""
+        sessions = data.get("sessions", {})
+        stored_ids = {
+            session_id for (session_id,) in connection.execute("SELECT id FROM sessions")
+        }
+        for session_id in stored_ids - sessions.keys():
+            self._delete_session_rows(connection, session_id)
+        for session_id, session_data in sessions.items():
+            self._write_session(connection, session_id, session_data)
+        connection.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)"
+            " ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (
+                ("current_session_id", json_dumps(data.get("current_session_id"))),
+                ("settings", json_dumps(data.get("settings", {}))),
+            ),
+        )
+
+    @staticmethod
+    def _write_session(
+        connection: sqlite3.Connection, session_id: str, session_data: dict[str, Any]
+    ) -> None:
+        """Write the document and alerts of one session (executor)."""
+        document = {
+            key: value for key, value in session_data.items()
+            if key not in _SESSION_TABLE_KEYS
+        }
+        connection.execute(
+            "INSERT INTO sessions (id, started_at, archived, data) VALUES (?, ?, ?, ?)"
+            " ON CONFLICT (id) DO UPDATE SET started_at = excluded.started_at,"
+            " archived = excluded.archived, data = excluded.data",
+            (
+                session_id,
+                session_data.get("started_at"),
+                int(bool(session_data.get("archived"))),
+                json_dumps(document),
+            ),
+        )
+        if "data_tiers" in session_data:
+            points = session_data.get("data_points")
+            _write_tiers(
+                connection,
+                session_id,
+                session_data["data_tiers"],
+                points[0]["ts"] if points else None,
+            )
+        if "device_log" in session_data:
+            _write_device_log(connection, session_id, session_data["device_log"])
+        connection.execute("DELETE FROM alerts WHERE session_id = ?", (session_id,))
+        connection.executemany(
+            "INSERT INTO alerts (session_id, timestamp, type, message, acknowledged)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (
+                (
+                    session_id,
+                    alert["timestamp"],
+                    alert["type"],
+                    alert["message"],
+                    int(alert.get("acknowledged", False)),
+                )
+                for alert in session_data.get("alerts", [])
+            ),
+        )
+
+    def _insert_newer_points(self, session_id: str, series: SessionTimeSeries) -> None:
+        """Insert the readings newer than the latest stored one (executor)."""
+        with self._connection as connection:
+            (latest,) = connection.execute(
+                "SELECT MAX(ts) FROM points WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            connection.executemany(
+                _INSERT_POINT,
+                (
+                    _point_row(session_id, point.to_dict())
+                    for point in series
+                    if latest is None or point.timestamp > latest
+                ),
+            )
+            _write_series_tiers(connection, session_id, series)
+            _write_device_log(connection, session_id, series.device_log_to_dict())
+
+    def _delete_session(self, session_id: str) -> None:
+        """Delete a session with its readings and alerts (executor)."""
+        with self._connection as connection:
+            self._delete_session_rows(connection, session_id)
+
+    @staticmethod
+    def _delete_session_rows(connection: sqlite3.Connection, session_id: str) -> None:
+        """Delete the rows of a session from every table (executor)."""
+        connection.execute("DELETE FROM points WHERE session_id = ?", (session_id,))
+        connection.execute("DELETE FROM alerts WHERE session_id = ?", (session_id,))
+        connection.execute("DELETE FROM device_log WHERE session_id = ?", (session_id,))
+        connection.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def _import(
+        self, data: dict[str, Any], archives: dict[str, SessionTimeSeries]
+    ) -> None:
+        """Write the contents of the JSON store in one transaction (executor)."""
+        with self._connection as connection:
+            # The snapshot carries the tiers and device logs of sessions that
+            # are not archived
+            self._write_snapshot(connection, data)
+            for session_id, session_data in data.get("sessions", {}).items():
+                series = archives.get(session_id)
+                if series is not None:
+                    points = [point.to_dict() for point in series]
+                    _write_series_tiers(connection, session_id, series)
+                    _write_device_log(
+                        connection, session_id, series.device_log_to_dict()
+                    )
+                else:
+                    points = [
+                        DataPoint.from_dict(point).to_dict()
+                        for point in session_data.get("data_points", [])
+                    ]
+                connection.executemany(
+                    _INSERT_POINT, (_point_row(session_id, point) for point in points)
+                )
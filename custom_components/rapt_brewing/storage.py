@@ -0,0 +1,313 @@
+"""Persistent storage for RAPT Brewing sessions."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+import os
+import shutil
+from typing import Any, Final
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import json_dumps
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util.json import json_loads
+
+from .data import SessionTimeSeries
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION: Final = 1
+STORAGE_KEY: Final = "rapt_brewing_sessions"
+
+# Fold the journal back into the snapshot after this many appended readings
+JOURNAL_COMPACT_RECORDS: Final = 500
+
+# Session fields that change with every reading and are journaled with it
+JOURNALED_SESSION_FIELDS: Final = (
+    "original_gravity",
+    "target_gravity",
+    "current_gravity",
+    "current_temperature",
+    "alcohol_percentage",
+    "attenuation",
+    "fermentation_rate",
+    "battery_calibrated",
+)
+
+
+def entry_storage_key(entry_id: str) -> str:
+    """Return the storage key holding the sessions of one config entry."""
+    return f"{STORAGE_KEY}.{entry_id}"
+
+
+async def async_migrate_legacy_storage(
+    hass: HomeAssistant, entry_id: str, remove_legacy: bool
+) -> bool:
+    """Copy the shared pre-sharding store into the shard of a config entry.
+
+    The legacy document does not record which entry wrote each session, so
+    every migrating entry receives a full copy and keeps its history. The
+    legacy files are removed with ``remove_legacy``, once the last entry has
+    its copy. Returns True if anything was copied.
+    """
+    legacy_path = hass.config.path(STORAGE_DIR, STORAGE_KEY)
+    shard_path = hass.config.path(STORAGE_DIR, entry_storage_key(entry_id))
+
+    def _copy() -> bool:
+        copied = False
+        for suffix in ("", ".journal"):
+            source = legacy_path + suffix
+            target = shard_path + suffix
+            if os.path.exists(source) and not os.path.exists(target):
+                shutil.copyfile(source, target)
+                copied = True
+        if remove_legacy:
+            for suffix in ("", ".journal"):
+                if os.path.exists(legacy_path + suffix):
+                    os.remove(legacy_path + suffix)
+        return copied
+
+    return await hass.async_add_executor_job(_copy)
+
+
+class RAPTBrewingStorage:
+    """Snapshot store with an append-only journal of new readings.
+
+    The snapshot is a regular ``Store`` document holding the current session
+    and summaries of archived sessions, whose data points are kept in one
+    compact binary archive file per session and only read on demand. New readings are appended
+    as single JSON lines to a journal file next to the snapshot, so recording
+    a reading costs the same no matter how much history exists.
+
+    Journal lines and snapshots are each written at most once per save
+    window. Every journal record carries a sequence number and the snapshot
+    remembers the last sequence it contains, which makes replay safe even if
+    the process stops between writing a snapshot and truncating the journal.
+    """
+
+    def __init__(self, hass: HomeAssistant, key: str) -> None:
+        """Initialize the storage."""
+        self.hass = hass
+        self._key = key
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, key)
+        self._journal_path = hass.config.path(STORAGE_DIR, f"{key}.journal")
+        self._journal_lock = asyncio.Lock()
+        self._journal_seq = 0
+        self._journal_records = 0
+        self._pending_lines: list[tuple[int, str]] = []
+        self._unsub_journal_flush: CALLBACK_TYPE | None = None
+        self._snapshot_func: Callable[[], dict[str, Any]] = dict
+        self._snapshot_pending = False
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Return True when the journal should be folded into the snapshot."""
+        return self._journal_records >= JOURNAL_COMPACT_RECORDS
+
+    async def async_load(self) -> dict[str, Any] | None:
+        """Load the snapshot and replay any journaled readings on top of it."""
+        data = await self._store.async_load()
+        async with self._journal_lock:
+            records = await self.hass.async_add_executor_job(self._read_journal)
+
+        snapshot_seq = data.get("journal_seq", 0) if data else 0
+        self._journal_seq = snapshot_seq
+        self._journal_records = 0
+
+        for record in records:
+            seq = record.get("seq", 0)
+            if seq <= snapshot_seq:
+                continue
+            self._journal_seq = max(self._journal_seq, seq)
+            self._journal_records += 1
+            if data is None:
+                continue
+            session_data = data.get("sessions", {}).get(record.get("session_id"))
+            if session_data is None:
+                # Session was deleted after the reading was journaled
+                continue
+            session_data.setdefault("data_points", []).append(record["point"])
+            session_data.update(record.get("fields", {}))
+
+        if self._journal_records:
+            _LOGGER.debug(
+                "RAPT STORAGE: Replayed %d journaled reading(s) from %s",
+                self._journal_records, self._journal_path,
+            )
+        return data
+
+    @callback
+    def async_append(
+        self,
+        session_id: str,
+        point: dict[str, Any],
+        fields: dict[str, Any],
+        delay: float,
+    ) -> None:
+        """Queue a reading for the journal, written within ``delay`` seconds."""
+        self._journal_seq += 1
+        self._pending_lines.append(
+            (
+                self._journal_seq,
+                json_dumps(
+                    {
+                        "seq": self._journal_seq,
+                        "session_id": session_id,
+                        "point": point,
+                        "fields": fields,
+                    }
+                ),
+            )
+        )
+        self._journal_records += 1
+        if self._unsub_journal_flush is None:
+            self._unsub_journal_flush = async_call_later(
+                self.hass, delay, self._async_handle_journal_timer
+            )
+
+    async def _async_handle_journal_timer(self, _now: Any) -> None:
+        """Write queued journal lines when the save window closes."""
+        self._unsub_journal_flush = None
+        await self._async_flush_journal()
+
+    async def _async_flush_journal(self) -> None:
+        """Append all queued lines to the journal file."""
+        async with self._journal_lock:
+            if not self._pending_lines:
+                return
+            lines = [line for _seq, line in self._pending_lines]
+            self._pending_lines = []
+            await self.hass.async_add_executor_job(self._write_journal, lines)
+
+    @callback
+    def async_delay_save(
+        self, data_func: Callable[[], dict[str, Any]], delay: float
+    ) -> None:
+        """Write a snapshot within ``delay`` seconds.
+
+        Requests made while a write is pending are coalesced into it rather
+        than postponing it, so a steady stream of changes is still written
+        once per window. ``data_func`` is evaluated when the write happens.
+        """
+        self._snapshot_func = data_func
+        if self._snapshot_pending:
+            return
+        self._snapshot_pending = True
+        self._store.async_delay_save(self._build_delayed_snapshot, delay)
+
+    @callback
+    def _build_delayed_snapshot(self) -> dict[str, Any]:
+        """Build the snapshot for a delayed write."""
+        self._snapshot_pending = False
+        return {**self._snapshot_func(), "journal_seq": self._journal_seq}
+
+    async def async_save(self, data_func: Callable[[], dict[str, Any]]) -> None:
+        """Write a full snapshot now and discard the journal it supersedes."""
+        async with self._journal_lock:
+            data = data_func()
+            snapshot_seq = self._journal_seq
+            # Saving now cancels any delayed write of the store
+            self._snapshot_pending = False
+            await self._store.async_save({**data, "journal_seq": snapshot_seq})
+            await self.hass.async_add_executor_job(self._truncate_journal)
+            # Readings queued while the snapshot was written are not part of it
+            self._pending_lines = [
+                (seq, line) for seq, line in self._pending_lines if seq > snapshot_seq
+            ]
+            self._journal_records = len(self._pending_lines)
+
+    async def async_flush(self) -> None:
+        """Write any queued journal lines and pending snapshot immediately."""
+        if self._unsub_journal_flush is not None:
+            self._unsub_journal_flush()
+            self._unsub_journal_flush = None
+        if self._snapshot_pending:
+            await self.async_save(self._snapshot_func)
+        await self._async_flush_journal()
+
+    async def async_close(self) -> None:
+        """Write anything queued; the store keeps no open resources."""
+        await self.async_flush()
+
+    def _archive_path(self, session_id: str) -> str:
+        """Return the path of the binary archive of a session."""
+        return self.hass.config.path(STORAGE_DIR, f"{self._key}.{session_id}.archive")
+
+    async def async_save_archive(self, session_id: str, series: SessionTimeSeries) -> None:
+        """Write the data points of a finished session to its binary archive."""
+        await self.hass.async_add_executor_job(
+            self._write_archive, self._archive_path(session_id), series
+        )
+
+    async def async_load_archive(self, session_id: str) -> SessionTimeSeries | None:
+        """Read the data points of a session from its binary archive."""
+        return await self.hass.async_add_executor_job(
+            self._read_archive, self._archive_path(session_id)
+        )
+
+    async def async_remove_archive(self, session_id: str) -> None:
+        """Delete the binary archive of a session."""
+        await self.hass.async_add_executor_job(
+            self._remove_file, self._archive_path(session_id)
+        )
+
+    @staticmethod
+    def _write_archive(path: str, series: SessionTimeSeries) -> None:
+        """Encode and atomically write an archive file (executor)."""
+        archive = series.to_bytes()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as archive_file:
+            archive_file.write(archive)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _read_archive(path: str) -> SessionTimeSeries | None:
+        """Read and decode an archive file (executor)."""
+        try:
+            with open(path, "rb") as archive_file:
+                archive = archive_file.read()
+        except FileNotFoundError:
+            return None
+        return SessionTimeSeries.from_bytes(archive)
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        """Remove a file if it exists (executor)."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _read_journal(self) -> list[dict[str, Any]]:
+        """Read all journal records (executor)."""
+        if not os.path.exists(self._journal_path):
+            return []
+
+        records: list[dict[str, Any]] = []
+        with open(self._journal_path, encoding="utf-8") as journal:
+            for line in journal:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json_loads(line))
+                except ValueError:
+                    # A torn final line from an interrupted write
+                    _LOGGER.warning(
+                        "RAPT STORAGE: Skipping unreadable journal record in %s",
+                        self._journal_path,
+                    )
+        return records
+
+    def _write_journal(self, lines: list[str]) -> None:
+        """Append lines to the journal (executor)."""
+        os.makedirs(os.path.dirname(self._journal_path), exist_ok=True)
+        with open(self._journal_path, "a", encoding="utf-8") as journal:
+            journal.writelines(line + "\n" for line in lines)
+
+    def _truncate_journal(self) -> None:
+        """Remove the journal file (executor)."""
+        self._remove_file(self._journal_path)
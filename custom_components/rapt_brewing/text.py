@@ -74,9 +74,10 @@ class RAPTBrewingText(RAPTBrewingEntity, TextEntity):
 
     async def _set_session_name(self, name: str) -> None:
         """Set session name."""
-        if self.coordinator.data.current_session and name.strip():
-            self.coordinator.data.current_session.name = name.strip()
-            await self.coordinator._save_data()
+        session = self.coordinator.data.current_session
+        if session and name.strip():
+            session.name = name.strip()
+            self.coordinator.async_schedule_save(session)
             await self.coordinator.async_request_refresh()
             _LOGGER.warning("RAPT TEXT: Updated session name to: %s", name.strip())
 